@@ -27,6 +27,7 @@ class AgentAdapter:
         self.index = CodeIndex(self.index_path)
         self.rules = RuleEngine(self.rules_path) if self.rules_path.exists() else None
         self.scoring = ScoringEngine(self.rules_path) if self.rules_path.exists() else None
+        self._violations: list[dict[str, Any]] | None = None
 
     def get_symbol_location(self, symbol: str) -> dict[str, Any] | None:
         """Find where a symbol is defined.
@@ -51,24 +52,28 @@ class AgentAdapter:
         if not self.scoring:
             return []
 
-        rankings = self.scoring.rank(self.index.data)
-        return rankings[:limit]
+        return self.scoring.rank(self.index.data, top=limit)
 
     def get_rule_violations(self) -> list[dict[str, Any]]:
         """Get all rule violations.
 
+        Violations are evaluated once and reused by later calls
+        (e.g. summarize_state followed by a full report).
+
         Returns:
             List of violations
         """
         if not self.rules:
             return []
 
-        violations: list[dict[str, Any]] = []
-        for file_data in self.index.data.get("files", []):
-            file_violations = self.rules.evaluate(file_data)
-            violations.extend(file_violations)
+        if self._violations is None:
+            violations: list[dict[str, Any]] = []
+            for file_data in self.index.data.get("files", []):
+                file_violations = self.rules.evaluate(file_data)
+                violations.extend(file_violations)
+            self._violations = violations
 
-        return violations
+        return list(self._violations)
 
     def get_complex_functions(self, threshold: int = 10) -> list[dict[str, Any]]:
         """Find functions exceeding complexity threshold.
@@ -2,11 +2,34 @@
 
 import hashlib
 import json
+import os
 from pathlib import Path
+from typing import NamedTuple
+
+# Import optional blake3 for SIMD-accelerated content hashing
+try:
+    import blake3
+
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+
+class FileSnapshot(NamedTuple):
+    """File contents together with the stat stamp taken when they were read."""
+
+    data: bytes
+    stat: tuple[int, int]
 
 
 class FileCache:
-    """Cache for tracking file hashes to enable incremental scans."""
+    """Cache for tracking file hashes to enable incremental scans.
+
+    Each hash is stored with the file's (mtime_ns, size) at the time it was
+    computed. A matching stat answers "unchanged" without reading the file;
+    otherwise the content hash decides, so files whose mtime was reset by a
+    branch switch still hit.
+    """
 
     def __init__(self, cache_file: Path | str = ".code_atlas_cache.json") -> None:
         """Initialize file cache.
@@ -16,20 +39,31 @@ class FileCache:
         """
         self.cache_file = Path(cache_file)
         self.cache: dict[str, str] = {}
+        self.stats: dict[str, tuple[int, int]] = {}
         self.load()
 
     def load(self) -> None:
         """Load cache from file."""
         if self.cache_file.exists():
             try:
-                self.cache = json.loads(self.cache_file.read_text(encoding="utf-8"))
+                data = json.loads(self.cache_file.read_text(encoding="utf-8"))
             except (json.JSONDecodeError, OSError):
-                self.cache = {}
+                data = {}
+
+            if isinstance(data.get("hashes"), dict):
+                self.cache = data["hashes"]
+                self.stats = {path: (stat[0], stat[1]) for path, stat in data.get("stats", {}).items()}
+            else:
+                # Older caches are a flat path -> hash mapping without stats
+                self.cache = data
+                self.stats = {}
 
     def save(self) -> None:
         """Save cache to file."""
         try:
-            self.cache_file.write_text(json.dumps(self.cache, indent=2), encoding="utf-8")
+            self.cache_file.write_text(
+                json.dumps({"hashes": self.cache, "stats": self.stats}, indent=2), encoding="utf-8"
+            )
         except OSError:
             pass  # Ignore write errors
 
@@ -49,9 +83,10 @@ class FileCache:
 
         Args:
             file_path: Path to file
-            file_hash: SHA-256 hash of file contents
+            file_hash: Content hash of the file, as returned by hash_bytes
         """
         self.cache[file_path] = file_hash
+        self.stats.pop(file_path, None)  # Stat is unknown for an externally supplied hash
 
     def remove(self, file_path: str) -> None:
         """Remove file from cache.
@@ -60,22 +95,27 @@ class FileCache:
             file_path: Path to file
         """
         self.cache.pop(file_path, None)
+        self.stats.pop(file_path, None)
 
-    def compute_hash(self, file_path: Path) -> str:
-        """Compute SHA-256 hash of file contents.
+    def compute_hash(self, file_path: Path | str, data: bytes | None = None) -> str:
+        """Compute the content hash of a file.
 
         Args:
             file_path: Path to file
+            data: File contents if already read (the file is read when not given)
 
         Returns:
             Hexadecimal hash string
         """
-        try:
-            return hashlib.sha256(file_path.read_bytes()).hexdigest()
-        except OSError:
-            return ""
+        if data is None:
+            try:
+                with open(file_path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                return ""
+        return hash_bytes(data)
 
-    def is_unchanged(self, file_path: Path) -> bool:
+    def is_unchanged(self, file_path: Path | str) -> bool:
         """Check if file is unchanged since last scan.
 
         Args:
@@ -84,36 +124,60 @@ class FileCache:
         Returns:
             True if file hash matches cached hash
         """
-        file_str = str(file_path)
+        file_str = os.fspath(file_path)
         cached_hash = self.get_hash(file_str)
         if cached_hash is None:
             return False
 
-        current_hash = self.compute_hash(file_path)
-        return current_hash == cached_hash
+        stat = _stat_key(file_str)
+        if stat is not None and self.stats.get(file_str) == stat:
+            return True
+
+        current_hash = self.compute_hash(file_str)
+        if current_hash != cached_hash:
+            return False
+        if stat is not None:
+            self.stats[file_str] = stat
+        return True
 
-    def update_file(self, file_path: Path) -> tuple[bool, str]:
+    def update_file(
+        self, file_path: Path | str, data: bytes | None = None, stat: tuple[int, int] | None = None
+    ) -> tuple[bool, str]:
         """Update cache entry for a file.
 
+        The file is only stat'ed when it is read here. Supplied contents are
+        stored with the supplied stamp (or none), never with a fresh stat:
+        the file may have changed since those contents were read.
+
         Args:
             file_path: Path to file
+            data: File contents if already read, to avoid reading the file again
+            stat: Stamp taken when data was read, as from read_snapshot
 
         Returns:
             Tuple of (changed, hash) where changed is True if file was modified
         """
-        file_str = str(file_path)
-        current_hash = self.compute_hash(file_path)
+        file_str = os.fspath(file_path)
+        if data is None:
+            try:
+                data, stat = read_snapshot(file_str)
+            except OSError:
+                stat = None
+        current_hash = "" if data is None else hash_bytes(data)
 
         cached_hash = self.get_hash(file_str)
         changed = cached_hash != current_hash
 
         self.set_hash(file_str, current_hash)
+        if stat is not None:
+            self.stats[file_str] = stat
 
         return changed, current_hash
 
     def clear(self) -> None:
         """Clear all cache entries."""
         self.cache = {}
+        self.stats = {}
 
     def cleanup(self, existing_files: set[str]) -> None:
         """Remove cache entries for files that no longer exist.
@@ -124,3 +188,59 @@ class FileCache:
         to_remove = [path for path in self.cache if path not in existing_files]
         for path in to_remove:
             self.remove(path)
+
+
+def hash_bytes(data: bytes) -> str:
+    """Hash file contents for change detection.
+
+    Uses BLAKE3 when installed, otherwise BLAKE2b; both give a 256-bit digest.
+
+    Args:
+        data: File contents
+
+    Returns:
+        Hexadecimal hash string (64 characters)
+    """
+    if BLAKE3_AVAILABLE:
+        digest: str = blake3.blake3(data).hexdigest()
+        return digest
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+
+def read_snapshot(file_path: Path | str) -> FileSnapshot:
+    """Read a file along with its stat stamp.
+
+    The stamp comes from fstat on the descriptor being read, taken before the
+    read, so an edit racing the read can only leave the stamp older than the
+    contents. The cache then rehashes on the next check rather than trusting
+    a stamp that belongs to newer contents.
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        Snapshot of the contents and their (mtime_ns, size)
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    with open(file_path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    return FileSnapshot(data, (stat.st_mtime_ns, stat.st_size))
+
+
+def _stat_key(file_path: Path | str) -> tuple[int, int] | None:
+    """Get the (mtime_ns, size) pair used as the cheap change check.
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        Tuple of (mtime_ns, size), or None if the file cannot be stat'ed
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -1,29 +1,82 @@
 """CLI interface for CodeAtlas."""
 
-import json
+import os
 import subprocess
 import sys
 from pathlib import Path
 
 import typer
 
-from code_atlas.agent_adapter import AgentAdapter
-from code_atlas.query import CodeIndex
-from code_atlas.rules import RuleEngine
-from code_atlas.scanner import scan_directory
-from code_atlas.scoring import ScoringEngine
+from code_atlas import jsonio
 
-# Optional rich for progress display
-try:
-    from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
-
-    RICH_AVAILABLE = True
-except ImportError:
-    RICH_AVAILABLE = False
+# Analysis modules are imported inside each command so that --help and
+# lightweight commands don't pay for loading the whole toolchain.
 
 app = typer.Typer(help="CodeAtlas - Agent-oriented Python codebase analyzer")
 
 
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process is running without importing psutil.
+
+    Args:
+        pid: Process ID to check
+
+    Returns:
+        True if the process exists
+    """
+    if sys.platform == "win32":
+        import ctypes
+
+        process_query_limited_information = 0x1000
+        still_active = 259
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(process_query_limited_information, False, pid)
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return False
+            return exit_code.value == still_active
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)  # Null signal: existence/permission check only
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Process exists but belongs to another user
+    return True
+
+
+def _tail_lines(path: Path, count: int) -> list[str]:
+    """Read the last lines of a file without loading all of it.
+
+    Args:
+        path: File to read
+        count: Number of trailing lines to return
+
+    Returns:
+        Up to ``count`` lines from the end of the file
+    """
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        chunk = min(end, max(4096, count * 200))
+        while True:
+            f.seek(end - chunk)
+            data = f.read(chunk)
+            # Stop once the window holds enough complete lines or reaches the start
+            if chunk == end or data.count(b"\n") > count:
+                break
+            chunk = min(end, chunk * 2)
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    if chunk < end:
+        lines = lines[1:]  # First line may be cut mid-way
+    return lines[-count:]
+
+
 @app.command()
 def scan(
     path: str = typer.Argument(..., help="Path to scan"),
@@ -33,6 +86,8 @@ def scan(
     verbose: bool = typer.Option(False, "--verbose", help="Show detailed progress information"),
 ) -> None:
     """Scan a Python codebase and generate structure index."""
+    from code_atlas.scanner import scan_directory
+
     root_path = Path(path).resolve()
     output_path = Path(output).resolve()
 
@@ -42,8 +97,17 @@ def scan(
     if deep:
         typer.echo("Deep analysis: including call graphs and type coverage")
 
-    # Set up progress display
-    if verbose and RICH_AVAILABLE:
+    # Set up progress display (optional rich is only loaded when requested)
+    rich_available = False
+    if verbose:
+        try:
+            from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
+
+            rich_available = True
+        except ImportError:
+            pass
+
+    if verbose and rich_available:
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -56,17 +120,29 @@ def scan(
                 progress.update(task, completed=current, total=total, description=f"Scanning: {file_path}")
 
             scan_directory(
-                root_path, output_path, incremental=incremental, deep=deep, progress_callback=progress_callback
+                root_path,
+                output_path,
+                incremental=incremental,
+                deep=deep,
+                progress_callback=progress_callback,
+                parallel=True,
             )
     elif verbose:
         # Fallback to basic echo if rich not available
         def progress_callback(file_path: str, current: int, total: int) -> None:
             typer.echo(f"[{current}/{total}] {file_path}")
 
-        scan_directory(root_path, output_path, incremental=incremental, deep=deep, progress_callback=progress_callback)
+        scan_directory(
+            root_path,
+            output_path,
+            incremental=incremental,
+            deep=deep,
+            progress_callback=progress_callback,
+            parallel=True,
+        )
     else:
         # No progress display
-        scan_directory(root_path, output_path, incremental=incremental, deep=deep)
+        scan_directory(root_path, output_path, incremental=incremental, deep=deep, parallel=True)
 
     typer.echo(f"Index written to {output_path}")
 
@@ -79,18 +155,20 @@ def rank(
     output: str = typer.Option("refactor_rank.json", help="Output file"),
 ) -> None:
     """Rank files by refactor priority."""
+    from code_atlas.query import CodeIndex
+    from code_atlas.scoring import ScoringEngine
+
     # Load code index
     ci = CodeIndex(index_file)
 
     # Create scoring engine
     se = ScoringEngine(rules)
 
-    # Rank files
-    rankings = se.rank(ci.data)
+    # Rank files, keeping only the top N
+    top_rankings = se.rank(ci.data, top=top)
 
     # Write top N to output file
-    top_rankings = rankings[:top]
-    Path(output).write_text(json.dumps(top_rankings, indent=2), encoding="utf-8")
+    jsonio.write_json_array(output, top_rankings)
 
     typer.echo(f"\nTop {len(top_rankings)} refactor priorities:")
     for i, item in enumerate(top_rankings, 1):
@@ -109,6 +187,9 @@ def check(
     output: str = typer.Option("violations.json", help="Output file"),
 ) -> None:
     """Check code against quality rules."""
+    from code_atlas.query import CodeIndex
+    from code_atlas.rules import RuleEngine
+
     # Load code index
     ci = CodeIndex(index_file)
 
@@ -116,13 +197,10 @@ def check(
     re = RuleEngine(rules)
 
     # Evaluate all files
-    all_violations = []
-    for file_data in ci.data.get("files", []):
-        violations = re.evaluate(file_data)
-        all_violations.extend(violations)
+    all_violations = re.evaluate_all(ci.data.get("files", []))
 
     # Write to output file
-    Path(output).write_text(json.dumps(all_violations, indent=2), encoding="utf-8")
+    jsonio.write_json_array(output, all_violations)
 
     typer.echo(f"\nFound {len(all_violations)} rule violations")
 
@@ -146,6 +224,8 @@ def agent(
     poor_docs: float = typer.Option(0.0, help="Find files below comment ratio threshold"),
 ) -> None:
     """Query codebase for agent integration (outputs JSON)."""
+    from code_atlas.agent_adapter import AgentAdapter
+
     # Initialize adapter
     adapter = AgentAdapter(Path.cwd(), index_file, rules)
 
@@ -171,8 +251,10 @@ def agent(
             "violations": adapter.get_rule_violations(),
         }
 
-    # Output JSON for subprocess consumption
-    typer.echo(json.dumps(result, indent=2))
+    # Output JSON for subprocess consumption, written as bytes straight to the stream
+    sys.stdout.buffer.write(jsonio.dumps(result))
+    sys.stdout.buffer.write(b"\n")
+    sys.stdout.flush()
 
 
 @app.command()
@@ -187,13 +269,14 @@ def watch(
     _daemon_child: bool = typer.Option(False, "--_daemon-child", hidden=True, help="Internal: daemon child process"),
 ) -> None:
     """Watch directory for Python file changes and update index."""
-    import os
-    import sys
+    import threading
     import time
 
-    from watchdog.events import FileSystemEventHandler
+    from watchdog.events import PatternMatchingEventHandler
     from watchdog.observers import Observer
 
+    from code_atlas.scanner import IGNORE_PATTERNS, scan_directory
+
     root_path = Path(path).resolve()
     output_path = Path(output).resolve()
     pid_path = Path(pid_file).resolve()
@@ -204,20 +287,10 @@ def watch(
         if pid_path.exists():
             try:
                 existing_pid = int(pid_path.read_text().strip())
-                # Check if process exists (Windows-compatible)
-                try:
-                    import psutil
-
-                    if psutil.pid_exists(existing_pid):
-                        typer.echo(f"Watch daemon already running (PID: {existing_pid})")
-                        typer.echo(f"PID file: {pid_path}")
-                        raise typer.Exit(1)
-                except ImportError:
-                    # Fallback without psutil - just check PID file age
-                    if time.time() - pid_path.stat().st_mtime < 3600:  # Less than 1 hour old
-                        typer.echo(f"Watch daemon may already be running (PID: {existing_pid})")
-                        typer.echo(f"Delete {pid_path} if daemon is not running")
-                        raise typer.Exit(1) from None
+                if _pid_alive(existing_pid):
+                    typer.echo(f"Watch daemon already running (PID: {existing_pid})")
+                    typer.echo(f"PID file: {pid_path}")
+                    raise typer.Exit(1)
             except (ValueError, OSError):
                 pass  # Invalid/stale PID file, continue
 
@@ -251,7 +324,6 @@ def watch(
         # Spawn detached process
         if sys.platform == "win32":
             # Windows: use CREATE_NEW_PROCESS_GROUP and DETACHED_PROCESS
-            import subprocess
             DETACHED_PROCESS = 0x00000008
             CREATE_NEW_PROCESS_GROUP = 0x00000200
             
@@ -275,54 +347,32 @@ def watch(
             typer.echo(f"Use 'uv run code-atlas stop-watch' to stop")
             return
         else:
-            # Unix: double fork to daemonize
+            # Unix: posix_spawn into a new session (no fork of this process)
             try:
-                pid = os.fork()
-                if pid > 0:
-                    # Parent process - exit
-                    typer.echo(f"✅ Watch daemon starting...")
-                    typer.echo(f"   PID file: {pid_path}")
-                    typer.echo(f"   Logs: {log_path}")
-                    typer.echo(f"\nUse 'uv run code-atlas watch-status' to check status")
-                    typer.echo(f"Use 'uv run code-atlas stop-watch' to stop")
-                    sys.exit(0)
+                pid = os.posix_spawn(
+                    sys.executable,
+                    cmd,
+                    os.environ,
+                    setsid=True,
+                    file_actions=[
+                        (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+                        (os.POSIX_SPAWN_OPEN, 1, str(log_path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644),
+                        (os.POSIX_SPAWN_DUP2, 1, 2),
+                    ],
+                )
             except OSError as e:
-                typer.echo(f"Fork failed: {e}")
+                typer.echo(f"Spawn failed: {e}")
                 raise typer.Exit(1) from e
-            
-            # First child
-            os.setsid()
-            
-            try:
-                pid = os.fork()
-                if pid > 0:
-                    sys.exit(0)  # Exit first child
-            except OSError as e:
-                sys.exit(1)
-            
-            # Second child - this is the daemon
-            os.chdir("/")
-            os.umask(0)
-            
-            # Redirect standard file descriptors
-            with open(log_path, "a", encoding="utf-8") as log_file:
-                os.dup2(log_file.fileno(), sys.stdout.fileno())
-                os.dup2(log_file.fileno(), sys.stderr.fileno())
-            
-            sys.stdin.close()
-            
+
             # Write PID file
-            pid_path.write_text(str(os.getpid()))
-            
-            print(f"\n{'=' * 80}")
-            print(f"Watch daemon started at {time.strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"PID: {os.getpid()}")
-            print(f"Watching: {root_path}")
-            print(f"Output: {output_path}")
-            print(f"Debounce: {debounce}s")
-            print(f"{'=' * 80}\n")
-            
-            # Continue to watch loop below (don't return)
+            pid_path.write_text(str(pid))
+
+            typer.echo(f"✅ Watch daemon started (PID: {pid})")
+            typer.echo(f"   PID file: {pid_path}")
+            typer.echo(f"   Logs: {log_path}")
+            typer.echo(f"\nUse 'uv run code-atlas watch-status' to check status")
+            typer.echo(f"Use 'uv run code-atlas stop-watch' to stop")
+            return
     
     # If we're the daemon child process, set up logging
     if _daemon_child:
@@ -331,8 +381,8 @@ def watch(
         # Write PID file
         pid_path.write_text(str(os.getpid()))
         
-        # Redirect output to log file
-        log_file = open(log_path, "a", encoding="utf-8")
+        # Redirect output to log file (line buffered, so rescans show up as they happen)
+        log_file = open(log_path, "a", encoding="utf-8", buffering=1)
         sys.stdout = log_file
         sys.stderr = log_file
         
@@ -344,45 +394,74 @@ def watch(
         print(f"Debounce: {debounce}s")
         print(f"{'=' * 80}\n")
 
-    # Track pending rescans
+    # Track pending rescans (paths changed since the last scan)
     last_scan_time = 0.0
-    pending_rescan = False
+    pending: set[str] = set()
+    pending_lock = threading.Lock()
+    wake = threading.Event()
 
-    class PythonFileHandler(FileSystemEventHandler):
+    class PythonFileHandler(PatternMatchingEventHandler):
         """Handle Python file change events."""
 
+        def __init__(self) -> None:
+            super().__init__(patterns=["*.py"], ignore_directories=True, case_sensitive=True)
+            self._root_len = len(str(root_path)) + 1
+
+        def dispatch(self, event: object) -> None:
+            """Drop events under ignored directories before pattern matching."""
+            # PurePath.match only anchors on the trailing components, so deep
+            # paths such as .venv/lib/.../x.py are pruned by directory name here.
+            # Moves are kept if either end lies outside the ignored directories.
+            paths = [event.src_path, getattr(event, "dest_path", "")]  # type: ignore
+            if not any(path and IGNORE_PATTERNS.isdisjoint(path[self._root_len :].split(os.sep)) for path in paths):
+                return
+            # Directory moves and deletes need not report the files inside; the rescan expands them
+            if event.is_directory:  # type: ignore
+                if event.event_type == "moved":  # type: ignore
+                    self.on_moved(event)
+                elif event.event_type == "deleted":  # type: ignore
+                    self.on_deleted(event)
+                return
+            super().dispatch(event)  # type: ignore
+
+        def _queue(self, path: str) -> None:
+            """Record a changed path for the next rescan."""
+            with pending_lock:
+                pending.add(path)
+            wake.set()
+
         def on_modified(self, event: object) -> None:
             """Handle file modification."""
-            nonlocal pending_rescan
-            if not event.is_directory and event.src_path.endswith(".py"):  # type: ignore
-                typer.echo(f"Detected change: {event.src_path}")  # type: ignore
-                pending_rescan = True
+            typer.echo(f"Detected change: {event.src_path}")  # type: ignore
+            self._queue(event.src_path)  # type: ignore
 
         def on_created(self, event: object) -> None:
             """Handle file creation."""
-            nonlocal pending_rescan
-            if not event.is_directory and event.src_path.endswith(".py"):  # type: ignore
-                typer.echo(f"Detected new file: {event.src_path}")  # type: ignore
-                pending_rescan = True
+            typer.echo(f"Detected new file: {event.src_path}")  # type: ignore
+            self._queue(event.src_path)  # type: ignore
 
         def on_deleted(self, event: object) -> None:
             """Handle file deletion."""
-            nonlocal pending_rescan
-            if not event.is_directory and event.src_path.endswith(".py"):  # type: ignore
-                typer.echo(f"Detected deletion: {event.src_path}")  # type: ignore
-                pending_rescan = True
+            typer.echo(f"Detected deletion: {event.src_path}")  # type: ignore
+            self._queue(event.src_path)  # type: ignore
+
+        def on_moved(self, event: object) -> None:
+            """Handle file rename (including editors saving via a temp file)."""
+            typer.echo(f"Detected move: {event.src_path} -> {event.dest_path}")  # type: ignore
+            self._queue(event.src_path)  # type: ignore
+            self._queue(event.dest_path)  # type: ignore
 
     # Initial scan
-    if not daemon:
+    if not _daemon_child:
         typer.echo(f"Performing initial scan of {root_path}...")
         if incremental:
             typer.echo("Incremental mode: enabled")
         if deep:
             typer.echo("Deep analysis: enabled")
 
-    scan_directory(root_path, output_path, incremental=incremental, deep=deep)
+    scan_directory(root_path, output_path, incremental=incremental, deep=deep, parallel=True)
 
-    if not daemon:
+    if not _daemon_child:
         typer.echo(f"Index written to {output_path}")
     last_scan_time = time.time()
 
@@ -397,23 +476,43 @@ def watch(
 
     try:
         while True:
-            time.sleep(0.5)
+            # Block until a change arrives; with changes pending, wake when the debounce window closes.
+            # Idle waits stay bounded so Ctrl+C is handled promptly on every platform.
+            with pending_lock:
+                has_pending = bool(pending)
+            if has_pending:
+                timeout = max(debounce - (time.time() - last_scan_time), 0.0)
+            else:
+                timeout = max(debounce, 1.0)
+            wake.wait(timeout=timeout)
+            wake.clear()
 
             # Check if rescan needed and debounce period passed
-            if pending_rescan and (time.time() - last_scan_time >= debounce):
-                if daemon:
-                    print(f"\nRescanning codebase at {time.strftime('%H:%M:%S')}...")
+            if time.time() - last_scan_time < debounce:
+                continue
+            # Take the batch atomically; events arriving during the scan queue up for the next one
+            with pending_lock:
+                batch, pending = pending, set()
+            if batch:
+                if _daemon_child:
+                    print(f"\nRescanning codebase at {time.strftime('%H:%M:%S')} ({len(batch)} changed file(s))...")
                 else:
-                    typer.echo("\nRescanning codebase...")
-
-                scan_directory(root_path, output_path, incremental=incremental, deep=deep)
+                    typer.echo(f"\nRescanning codebase ({len(batch)} changed file(s))...")
+
+                scan_directory(
+                    root_path,
+                    output_path,
+                    incremental=incremental,
+                    deep=deep,
+                    changed_paths={Path(changed) for changed in batch},
+                    parallel=True,
+                )
 
-                if daemon:
+                if _daemon_child:
                     print(f"Index updated at {output_path}")
                 else:
                     typer.echo(f"Index updated at {output_path}")
 
-                pending_rescan = False
                 last_scan_time = time.time()
 
     except KeyboardInterrupt:
@@ -440,13 +539,13 @@ def watch_status(
     pid_file: str = typer.Option(".code_atlas_watch.pid", help="PID file for daemon"),
     output: str = typer.Option("code_index.json", help="Output file path"),
     log_lines: int = typer.Option(20, help="Number of recent log lines to show"),
+    stats: bool = typer.Option(False, "--stats", help="Show CPU/memory usage (requires psutil)"),
 ) -> None:
     """Check watch daemon status and show recent activity."""
-    import os
     import time
 
-    pid_path = Path(pid_file).resolve()
-    output_path = Path(output).resolve()
+    pid_path = Path(os.path.abspath(pid_file))
+    output_path = Path(os.path.abspath(output))
     log_path = output_path.parent / f"{output_path.stem}_watch.log"
 
     # Check PID file
@@ -466,41 +565,31 @@ def watch_status(
         raise typer.Exit(1) from None
 
     # Check if process is actually running
-    is_running = False
-    try:
-        import psutil
-
-        if psutil.pid_exists(pid):
-            proc = psutil.Process(pid)
-            is_running = True
-            typer.echo(f"✅ Watch daemon is RUNNING")
-            typer.echo(f"   PID: {pid}")
-            typer.echo(f"   Status: {proc.status()}")
-            typer.echo(f"   CPU: {proc.cpu_percent(interval=0.1):.1f}%")
-            typer.echo(f"   Memory: {proc.memory_info().rss / 1024 / 1024:.1f} MB")
-            typer.echo(f"   Started: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(proc.create_time()))}")
-    except ImportError:
-        # Fallback without psutil
-        try:
-            os.kill(pid, 0)  # Check if process exists (Unix)
-            is_running = True
-            typer.echo(f"✅ Watch daemon appears to be running")
-            typer.echo(f"   PID: {pid}")
-        except (OSError, AttributeError):
-            # On Windows without psutil, check PID file age
-            file_age = time.time() - pid_path.stat().st_mtime
-            if file_age < 300:  # Less than 5 minutes old
-                is_running = True
-                typer.echo(f"⚠️  Watch daemon status unknown (install psutil for accurate status)")
-                typer.echo(f"   PID: {pid}")
-                typer.echo(f"   PID file age: {file_age:.0f}s")
-
-    if not is_running:
-        typer.echo(f"❌ Watch daemon NOT running (stale PID file)")
+    if not _pid_alive(pid):
+        typer.echo("❌ Watch daemon NOT running (stale PID file)")
         typer.echo(f"   PID {pid} not found")
-        typer.echo(f"   Run 'uv run code-atlas stop-watch' to cleanup")
+        typer.echo("   Run 'uv run code-atlas stop-watch' to cleanup")
         raise typer.Exit(1)
 
+    typer.echo("✅ Watch daemon is RUNNING")
+    typer.echo(f"   PID: {pid}")
+
+    # Process stats need psutil, which is only imported on request
+    if stats:
+        try:
+            import psutil
+        except ImportError:
+            typer.echo("   Install psutil to show CPU/memory stats")
+        else:
+            try:
+                proc = psutil.Process(pid)
+                typer.echo(f"   Status: {proc.status()}")
+                typer.echo(f"   CPU: {proc.cpu_percent(interval=0.1):.1f}%")
+                typer.echo(f"   Memory: {proc.memory_info().rss / 1024 / 1024:.1f} MB")
+                typer.echo(f"   Started: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(proc.create_time()))}")
+            except psutil.Error as e:
+                typer.echo(f"   Stats unavailable: {e}")
+
     # Show file info
     typer.echo(f"\n📁 Files:")
     typer.echo(f"   PID file: {pid_path}")
@@ -516,8 +605,7 @@ def watch_status(
         typer.echo(f"\n📋 Recent log activity (last {log_lines} lines):")
         typer.echo("   " + "─" * 60)
         try:
-            lines = log_path.read_text(encoding="utf-8").splitlines()
-            for line in lines[-log_lines:]:
+            for line in _tail_lines(log_path, log_lines):
                 typer.echo(f"   {line}")
         except OSError as e:
             typer.echo(f"   Error reading log: {e}")
@@ -528,10 +616,9 @@ def stop_watch(
     pid_file: str = typer.Option(".code_atlas_watch.pid", help="PID file for daemon"),
 ) -> None:
     """Stop the watch daemon."""
-    import os
     import signal
 
-    pid_path = Path(pid_file).resolve()
+    pid_path = Path(os.path.abspath(pid_file))
 
     if not pid_path.exists():
         typer.echo("No watch daemon running (PID file not found)")
@@ -0,0 +1,122 @@
+"""JSON serialization helpers with optional orjson acceleration."""
+
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+# Import optional orjson for native-speed serialization
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize object to indented UTF-8 JSON bytes.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        Encoded JSON document
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def write_json_array(path: str | Path, items: Iterable[Any]) -> None:
+    """Stream a JSON array to disk, one compact element per line.
+
+    Elements are serialized and written as they are produced, so the full
+    document never has to be held in memory alongside the source list.
+
+    Args:
+        path: Output file path
+        items: JSON-serializable array elements
+    """
+    with open(path, "wb") as f:
+        _write_items(f, b"[", b"]", map(_dumps_compact, items), b"\n  ")
+        f.write(b"\n")
+
+
+def write_json_object(path: str | Path, fields: Iterable[tuple[str, Any]]) -> None:
+    """Stream a JSON object to disk, one field per line.
+
+    Fields are pulled one at a time, after the previous value has been
+    written, so a generator can yield a field computed from elements
+    streamed earlier. Iterator values are written element by element as
+    arrays and dict values one entry per line; other values are compact.
+
+    Args:
+        path: Output file path
+        fields: (key, value) pairs in output order
+    """
+    with open(path, "wb") as f:
+        f.write(b"{")
+        separator = b"\n  "
+        for key, value in fields:
+            f.write(separator)
+            f.write(_dumps_compact(key) + b": ")
+            if isinstance(value, Iterator):
+                _write_items(f, b"[", b"]", map(_dumps_compact, value), b"\n    ")
+            elif isinstance(value, dict):
+                entries = (_dumps_compact(k) + b": " + _dumps_compact(v) for k, v in value.items())
+                _write_items(f, b"{", b"}", entries, b"\n    ")
+            else:
+                f.write(_dumps_compact(value))
+            separator = b",\n  "
+        f.write(b"}\n" if separator == b"\n  " else b"\n}\n")
+
+
+def _write_items(f: BinaryIO, open_: bytes, close: bytes, chunks: Iterable[bytes], indent: bytes) -> None:
+    """Write encoded container items, one per indented line.
+
+    Args:
+        f: Binary file to write to
+        open_: Opening bracket
+        close: Closing bracket
+        chunks: Encoded items
+        indent: Newline plus indentation preceding each item
+    """
+    f.write(open_)
+    separator = indent
+    for chunk in chunks:
+        f.write(separator)
+        f.write(chunk)
+        separator = b"," + indent
+    f.write(close if separator == indent else indent[:-2] + close)
+
+
+def _dumps_compact(obj: Any) -> bytes:
+    """Serialize object to compact UTF-8 JSON bytes.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        Encoded JSON document without indentation
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Deserialize a JSON document.
+
+    Args:
+        data: Encoded JSON document (bytes are parsed without a decode round-trip)
+
+    Returns:
+        Parsed Python object
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,9 +1,10 @@
 """Query API for code index with O(1) lookups."""
 
-import json
 from pathlib import Path
 from typing import Any
 
+from code_atlas import jsonio
+
 
 class CodeIndex:
     """In-memory code index with fast lookup capabilities."""
@@ -14,8 +15,7 @@ class CodeIndex:
         Args:
             index_path: Path to code_index.json file
         """
-        with open(index_path, encoding="utf-8") as f:
-            self.data = json.load(f)
+        self.data = jsonio.loads(Path(index_path).read_bytes())
 
         self._build_indices()
 
@@ -1,10 +1,94 @@
 """Rule engine for dynamic code analysis based on YAML configuration."""
 
+import ast
+import operator
+import os
+from collections.abc import Callable
+from functools import reduce
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 import yaml
 
+# Import optional numpy for vectorized batch evaluation
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Predicate over a rule evaluation context (file metrics + thresholds)
+Predicate = Callable[[dict[str, Any]], Any]
+
+# Per-file values available to rule conditions
+FILE_METRICS = frozenset({"complexity", "loc", "comment_ratio"})
+
+_COMPARE_OPS: dict[type[ast.cmpop], Callable[[Any, Any], Any]] = {
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+
+class Rule(NamedTuple):
+    """Rule definition compiled for evaluation."""
+
+    id: str
+    predicate: Predicate
+    vector_predicate: Predicate | None
+    message: str
+    action: str
+
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed configs and compiled rule sets keyed by absolute path, each stored
+# with the (mtime_ns, size) stamp of the file it was built from
+_CONFIG_CACHE: dict[str, tuple[tuple[int, int], Any]] = {}
+_COMPILED_CACHE: dict[str, tuple[tuple[int, int], Any, dict[str, Any], list[Rule]]] = {}
+
+
+def _file_stamp(path: str | Path) -> tuple[str, tuple[int, int]]:
+    """Get the cache key and change stamp for a file.
+
+    Args:
+        path: Path to file
+
+    Returns:
+        Tuple of (absolute path, (mtime_ns, size))
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    return key, (stat.st_mtime_ns, stat.st_size)
+
+
+def load_rules_config(rules_path: str | Path) -> Any:
+    """Load a rules YAML file, reusing the parsed result while the file is unchanged.
+
+    Args:
+        rules_path: Path to rules.yaml file
+
+    Returns:
+        Parsed YAML document (shared between callers; treat as read-only)
+
+    Raises:
+        FileNotFoundError: If the rules file doesn't exist
+    """
+    key, stamp = _file_stamp(rules_path)
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with open(key, encoding="utf-8") as f:
+        config = yaml.load(f, Loader=_YAML_LOADER)  # noqa: S506 - always a safe loader
+    _CONFIG_CACHE[key] = (stamp, config)
+    return config
+
 
 class RuleEngine:
     """Dynamic rule engine for code quality checks."""
@@ -15,8 +99,135 @@ class RuleEngine:
         Args:
             rules_path: Path to rules.yaml file
         """
-        with open(rules_path, encoding="utf-8") as f:
-            self.config = yaml.safe_load(f)
+        self.config: Any
+        self._metric_ctx: dict[str, Any]
+        self._rules: list[Rule]
+
+        # Reuse the compiled rule set while the rules file is unchanged
+        key, stamp = _file_stamp(rules_path)
+        compiled = _COMPILED_CACHE.get(key)
+        if compiled is not None and compiled[0] == stamp:
+            _, self.config, self._metric_ctx, self._rules = compiled
+            return
+
+        self.config = load_rules_config(rules_path)
+
+        # Thresholds are constant for the engine's lifetime
+        metrics = self.config.get("metrics", {})
+        self._metric_ctx = {
+            "max_complexity": metrics.get("max_complexity", 10),
+            "max_loc": metrics.get("max_loc", 500),
+            "min_comment_ratio": metrics.get("min_comment_ratio", 0.1),
+        }
+
+        # Compile each condition once instead of re-parsing it per file; invalid rules never match
+        self._rules = []
+        for action in self.config.get("actions", []):
+            predicate, vector_predicate = self._compile(action)
+            if predicate is not None:
+                self._rules.append(
+                    Rule(
+                        action.get("id", "UNKNOWN"),
+                        predicate,
+                        vector_predicate,
+                        action.get("message", ""),
+                        action.get("action", ""),
+                    )
+                )
+
+        _COMPILED_CACHE[key] = (stamp, self.config, self._metric_ctx, self._rules)
+
+    def _compile(self, action: dict[str, Any]) -> tuple[Predicate | None, Predicate | None]:
+        """Compile a rule condition to predicates.
+
+        Simple comparisons between file metrics, thresholds and literals are
+        translated to native Python callables with the thresholds bound as
+        constants. Anything else falls back to evaluating a compiled code object.
+
+        Args:
+            action: Rule definition from the actions list
+
+        Returns:
+            Tuple of (predicate, vector_predicate). The predicate is None if the
+            condition is invalid; the vector predicate is None when the condition
+            can't be evaluated over numpy columns.
+        """
+        condition = action.get("condition", "")
+        try:
+            tree = ast.parse(condition, mode="eval")
+            code = compile(tree, f"<rule:{action.get('id', 'UNKNOWN')}>", "eval")
+        except (SyntaxError, ValueError, TypeError):
+            return None, None
+
+        vector_predicate = self._build_predicate(tree.body, vectorized=True) if NUMPY_AVAILABLE else None
+
+        predicate = self._build_predicate(tree.body)
+        if predicate is not None:
+            return predicate, vector_predicate
+
+        def evaluate_code(context: dict[str, Any]) -> Any:
+            return eval(code, {"__builtins__": {}}, context)  # noqa: S307
+
+        return evaluate_code, vector_predicate
+
+    def _build_predicate(self, node: ast.expr, vectorized: bool = False) -> Predicate | None:
+        """Translate a condition AST into a native predicate.
+
+        Args:
+            node: Condition expression node
+            vectorized: Combine sub-expressions element-wise over numpy arrays
+
+        Returns:
+            Native predicate or None if the expression is not supported
+        """
+        all_of, any_of, not_of = (
+            (_all_of_arrays, _any_of_arrays, _not_array) if vectorized else (_all_of, _any_of, _not)
+        )
+
+        if isinstance(node, ast.Compare):
+            operands = [self._build_operand(o) for o in (node.left, *node.comparators)]
+            ops = [_COMPARE_OPS.get(type(op)) for op in node.ops]
+            pairs: list[Predicate] = []
+            for i, op in enumerate(ops):
+                left, right = operands[i], operands[i + 1]
+                if op is None or left is None or right is None:
+                    return None
+                pairs.append(_compare(op, left, right))
+            return pairs[0] if len(pairs) == 1 else all_of(pairs)
+
+        if isinstance(node, ast.BoolOp):
+            parts = [self._build_predicate(value, vectorized) for value in node.values]
+            if any(part is None for part in parts):
+                return None
+            predicates = [part for part in parts if part is not None]
+            return all_of(predicates) if isinstance(node.op, ast.And) else any_of(predicates)
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            inner = self._build_predicate(node.operand, vectorized)
+            if inner is None:
+                return None
+            return not_of(inner)
+
+        return None
+
+    def _build_operand(self, node: ast.expr) -> tuple[bool, Any] | None:
+        """Resolve a comparison operand.
+
+        Args:
+            node: Operand expression node
+
+        Returns:
+            Tuple of (is_constant, value) where value is a metric name for
+            per-file metrics, or None if the operand is not supported
+        """
+        if isinstance(node, ast.Name):
+            if node.id in FILE_METRICS:
+                return False, node.id
+            if node.id in self._metric_ctx:
+                return True, self._metric_ctx[node.id]
+        elif isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return True, node.value
+        return None
 
     def evaluate(self, file_data: dict[str, Any]) -> list[dict[str, Any]]:
         """Evaluate rules against file data.
@@ -29,56 +240,130 @@ class RuleEngine:
         """
         issues: list[dict[str, Any]] = []
 
-        metrics = self.config.get("metrics", {})
-        actions = self.config.get("actions", [])
-
-        for action in actions:
-            rule_id = action.get("id", "UNKNOWN")
-            condition = action.get("condition", "")
-            message = action.get("message", "")
-            suggested_action = action.get("action", "")
-
-            if self._check_condition(condition, file_data, metrics):
-                issues.append(
-                    {
-                        "id": rule_id,
-                        "message": message,
-                        "action": suggested_action,
-                        "file": file_data.get("path", ""),
-                    }
+        try:
+            context = self._build_context(file_data)
+        except Exception:
+            # Malformed file data can't satisfy any rule
+            return issues
+
+        file_path = file_data.get("path", "")
+
+        for rule in self._rules:
+            if self._check_condition(rule.predicate, context):
+                issues.append(self._violation(rule, file_path))
+
+        return issues
+
+    def evaluate_all(self, files: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Evaluate rules against every file in an index.
+
+        With numpy installed, the file metrics are gathered into columns once
+        and each native condition is evaluated as a single boolean mask.
+        Violations are returned in the same order as calling evaluate() per file.
+
+        Args:
+            files: File analysis data from scanner
+
+        Returns:
+            List of rule violations with details
+        """
+        if not NUMPY_AVAILABLE or not files:
+            return [issue for file_data in files for issue in self.evaluate(file_data)]
+
+        contexts: list[dict[str, Any] | None] = []
+        for file_data in files:
+            try:
+                contexts.append(self._build_context(file_data))
+            except Exception:
+                contexts.append(None)
+
+        count = len(contexts)
+        try:
+            columns = {
+                name: np.fromiter(
+                    (context[name] if context is not None else 0.0 for context in contexts),
+                    dtype=np.float64,
+                    count=count,
                 )
+                for name in FILE_METRICS
+            }
+        except (TypeError, ValueError):
+            # Non-numeric metrics: evaluate file by file
+            return [issue for file_data in files for issue in self.evaluate(file_data)]
+        valid = np.fromiter((context is not None for context in contexts), dtype=bool, count=count)
+
+        # Rule indices hit by each file, in rule order
+        hits: list[list[int]] = [[] for _ in range(count)]
+        for rule_idx, rule in enumerate(self._rules):
+            matched: Any = None
+            if rule.vector_predicate is not None:
+                try:
+                    mask = np.broadcast_to(rule.vector_predicate(columns), (count,))
+                    matched = np.flatnonzero(mask & valid)
+                except Exception:
+                    matched = None
+            if matched is None:
+                matched = [
+                    i
+                    for i, context in enumerate(contexts)
+                    if context is not None and self._check_condition(rule.predicate, context)
+                ]
+            for file_idx in matched:
+                hits[file_idx].append(rule_idx)
+
+        issues: list[dict[str, Any]] = []
+        for file_data, rule_indices in zip(files, hits, strict=True):
+            file_path = file_data.get("path", "")
+            for rule_idx in rule_indices:
+                issues.append(self._violation(self._rules[rule_idx], file_path))
 
         return issues
 
-    def _check_condition(
-        self,
-        condition: str,
-        file_data: dict[str, Any],
-        metrics: dict[str, Any],
-    ) -> bool:
-        """Check if condition is met.
+    def _violation(self, rule: Rule, file_path: str) -> dict[str, Any]:
+        """Build a violation record for a rule hit.
+
+        Args:
+            rule: Matched rule
+            file_path: Path of the violating file
+
+        Returns:
+            Violation dict with id, message, action and file
+        """
+        return {
+            "id": rule.id,
+            "message": rule.message,
+            "action": rule.action,
+            "file": file_path,
+        }
+
+    def _build_context(self, file_data: dict[str, Any]) -> dict[str, Any]:
+        """Build the evaluation context shared by all rules for a file.
 
         Args:
-            condition: Condition expression to evaluate
             file_data: File analysis data
-            metrics: Metrics thresholds
+
+        Returns:
+            Context with file metrics and thresholds
+        """
+        return {
+            **self._metric_ctx,
+            "complexity": self._get_avg_complexity(file_data),
+            "loc": file_data.get("raw", {}).get("loc", 0),
+            "comment_ratio": file_data.get("comment_ratio", 0.0),
+        }
+
+    def _check_condition(self, predicate: Predicate, context: dict[str, Any]) -> bool:
+        """Check if condition is met.
+
+        Args:
+            predicate: Compiled condition predicate
+            context: Evaluation context for the file
 
         Returns:
             True if condition is met
         """
         try:
-            # Build evaluation context
-            context = {
-                "complexity": self._get_avg_complexity(file_data),
-                "loc": file_data.get("raw", {}).get("loc", 0),
-                "comment_ratio": file_data.get("comment_ratio", 0.0),
-                "max_complexity": metrics.get("max_complexity", 10),
-                "max_loc": metrics.get("max_loc", 500),
-                "min_comment_ratio": metrics.get("min_comment_ratio", 0.1),
-            }
-
-            # Safely evaluate condition
-            return bool(eval(condition, {"__builtins__": {}}, context))  # noqa: S307
+            return bool(predicate(context))
         except Exception:
             # If evaluation fails, don't flag as violation
             return False
@@ -96,5 +381,61 @@ class RuleEngine:
         if not complexity_list:
             return 0.0
 
-        total = sum(c.get("complexity", 0) for c in complexity_list)
+        total = 0
+        for c in complexity_list:
+            total += c.get("complexity", 0)
         return float(total / len(complexity_list))
+
+
+def _compare(op: Callable[[Any, Any], Any], left: tuple[bool, Any], right: tuple[bool, Any]) -> Predicate:
+    """Build a comparison predicate with constant operands bound in.
+
+    Args:
+        op: Comparison operator function
+        left: Left operand as (is_constant, value)
+        right: Right operand as (is_constant, value)
+
+    Returns:
+        Predicate applying the comparison to a context
+    """
+    left_const, left_value = left
+    right_const, right_value = right
+
+    if left_const and right_const:
+        result = op(left_value, right_value)
+        return lambda context: result
+    if right_const:
+        return lambda context: op(context[left_value], right_value)
+    if left_const:
+        return lambda context: op(left_value, context[right_value])
+    return lambda context: op(context[left_value], context[right_value])
+
+
+def _not(predicate: Predicate) -> Predicate:
+    """Negate a predicate."""
+    return lambda context: not predicate(context)
+
+
+def _all_of(predicates: list[Predicate]) -> Predicate:
+    """Combine predicates with short-circuit AND."""
+    return lambda context: all(predicate(context) for predicate in predicates)
+
+
+def _any_of(predicates: list[Predicate]) -> Predicate:
+    """Combine predicates with short-circuit OR."""
+    return lambda context: any(predicate(context) for predicate in predicates)
+
+
+def _not_array(predicate: Predicate) -> Predicate:
+    """Negate a vectorized predicate element-wise."""
+    return lambda columns: np.logical_not(predicate(columns))
+
+
+def _all_of_arrays(predicates: list[Predicate]) -> Predicate:
+    """Combine vectorized predicates with element-wise AND."""
+    return lambda columns: reduce(np.logical_and, (predicate(columns) for predicate in predicates))
+
+
+def _any_of_arrays(predicates: list[Predicate]) -> Predicate:
+    """Combine vectorized predicates with element-wise OR."""
+    return lambda columns: reduce(np.logical_or, (predicate(columns) for predicate in predicates))
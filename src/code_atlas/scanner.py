@@ -2,15 +2,23 @@
 
 import ast
 import json
+import multiprocessing
+import os
+import re
 import subprocess
-from collections.abc import Callable
-from datetime import datetime
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-from radon.complexity import cc_visit
+from radon.complexity import cc_visit, cc_visit_ast
 from radon.raw import analyze
 
+from code_atlas import jsonio
+from code_atlas.cache import FileCache, FileSnapshot, read_snapshot
+
 # Import optional dependencies for deep analysis
 try:
     import mypy.api
@@ -19,60 +27,209 @@ try:
 except ImportError:
     MYPY_AVAILABLE = False
 
+# Import optional libgit2 bindings for in-process git history
+try:
+    import pygit2
+
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+
+# Directory names never descended into while scanning
+IGNORE_PATTERNS = frozenset({".venv", "venv", "__pycache__", ".git", "node_modules", ".pytest_cache", ".mypy_cache"})
+
+# code_index.json schema version; bumped whenever the document's keys change
+INDEX_VERSION = "0.2.0"
+
+# Minimum number of files to scan before fanning out to worker processes
+PARALLEL_MIN_FILES = 32
+
+# "path:line[:col]: error: ..." lines in mypy output
+_MYPY_ERROR_RE = re.compile(r"^(?P<path>.+?):\d+(?::\d+)?: error:", re.MULTILINE)
+
+# Git history per resolved scan root, with the HEAD commit it was read at
+_GIT_HISTORY_CACHE: dict[str, tuple[str, dict[str, dict[str, Any]]]] = {}
+
+
+class FileVisitor:
+    """Collect imports and per-function calls in a single traversal.
+
+    The tree is walked iteratively with an explicit stack, avoiding
+    ``ast.NodeVisitor``'s per-node method lookup and recursion.
+    """
+
+    def __init__(self) -> None:
+        self.imports: list[str] = []
+        # Dotted name of each imported object ("pkg.mod" for ``from pkg import mod``)
+        self.import_refs: list[str] = []
+        self.calls: dict[str, set[str]] = {}
+
+    def visit(self, tree: ast.AST) -> None:
+        """Walk a tree in source order, recording what it imports and calls.
+
+        Args:
+            tree: Parsed AST tree
+        """
+        # Each entry carries the name of the innermost enclosing function
+        stack: list[tuple[ast.AST, str | None]] = [(tree, None)]
+        pop, push = stack.pop, stack.append
+        while stack:
+            node, func = pop()
+
+            if isinstance(node, ast.Call):
+                if func is not None:
+                    # Extract called function name
+                    if isinstance(node.func, ast.Name):
+                        self.calls[func].add(node.func.id)
+                    elif isinstance(node.func, ast.Attribute):
+                        self.calls[func].add(node.func.attr)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                func = node.name
+                self.calls[func] = set()
+            elif isinstance(node, ast.Import):
+                self.imports.extend(alias.name for alias in node.names)
+                self.import_refs.extend(alias.name for alias in node.names)
+                continue
+            elif isinstance(node, ast.ImportFrom):
+                if node.module:
+                    self.imports.append(node.module)
+                prefix = f"{node.module}." if node.module else ""
+                for alias in node.names:
+                    if alias.name != "*":
+                        self.import_refs.append(prefix + alias.name)
+                    elif node.module:
+                        self.import_refs.append(node.module)
+                continue
+
+            # Push children reversed so they are popped in source order
+            for field in reversed(node._fields):
+                value = getattr(node, field, None)
+                if isinstance(value, list):
+                    for item in reversed(value):
+                        if isinstance(item, ast.AST):
+                            push((item, func))
+                elif isinstance(value, ast.AST):
+                    push((value, func))
+
+
+def _class_entity(node: ast.ClassDef) -> dict[str, Any]:
+    """Build the entity dict for a class definition.
+
+    Args:
+        node: Class definition node
+
+    Returns:
+        Entity dict with methods and bases
+    """
+    methods = [m.name for m in node.body if isinstance(m, (ast.FunctionDef, ast.AsyncFunctionDef))]
+    bases = [_base_name(base) for base in node.bases]
+    return {
+        "type": "class",
+        "name": node.name,
+        "lineno": node.lineno,
+        "end_lineno": node.end_lineno or node.lineno,
+        "docstring": ast.get_docstring(node),
+        "methods": methods,
+        "bases": bases,
+    }
+
+
+def _base_name(node: ast.expr) -> str:
+    """Render a class base as source text.
+
+    Plain names and dotted attribute chains are built directly; anything
+    else (subscripts, calls) falls back to ``ast.unparse``.
+
+    Args:
+        node: Base class expression
+
+    Returns:
+        Source text of the base
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return f"{_base_name(node.value)}.{node.attr}"
+    return ast.unparse(node)
+
 
-def extract_entities(tree: ast.AST) -> list[dict[str, Any]]:
-    """Extract all classes and functions from AST.
+def _function_entity(node: ast.FunctionDef | ast.AsyncFunctionDef, entity_type: str) -> dict[str, Any]:
+    """Build the entity dict for a function definition.
 
     Args:
-        tree: Parsed AST tree
+        node: Function definition node
+        entity_type: "function" or "async_function"
+
+    Returns:
+        Entity dict
+    """
+    return {
+        "type": entity_type,
+        "name": node.name,
+        "lineno": node.lineno,
+        "end_lineno": node.end_lineno or node.lineno,
+        "docstring": ast.get_docstring(node),
+    }
+
+
+def _definition_entity(node: ast.stmt) -> dict[str, Any] | None:
+    """Build the entity dict for a class or function statement.
+
+    Args:
+        node: Statement node
+
+    Returns:
+        Entity dict, or None if the statement defines nothing
+    """
+    if isinstance(node, ast.ClassDef):
+        return _class_entity(node)
+    if isinstance(node, ast.AsyncFunctionDef):
+        return _function_entity(node, "async_function")
+    if isinstance(node, ast.FunctionDef):
+        return _function_entity(node, "function")
+    return None
+
+
+def extract_entities(tree: ast.Module) -> list[dict[str, Any]]:
+    """Extract top-level classes and functions, plus the members of each class.
+
+    Only module-level statements and one level of class bodies are visited;
+    definitions nested inside functions or control flow are skipped.
+
+    Args:
+        tree: Parsed module tree
 
     Returns:
         List of entity dicts with type, name, lineno, end_lineno, docstring
     """
     entities: list[dict[str, Any]] = []
 
-    for node in ast.walk(tree):
+    for node in tree.body:
+        entity = _definition_entity(node)
+        if entity is None:
+            continue
+        entities.append(entity)
         if isinstance(node, ast.ClassDef):
-            methods = [m.name for m in node.body if isinstance(m, (ast.FunctionDef, ast.AsyncFunctionDef))]
-            bases = [ast.unparse(base) for base in node.bases]
-            entities.append(
-                {
-                    "type": "class",
-                    "name": node.name,
-                    "lineno": node.lineno,
-                    "end_lineno": node.end_lineno or node.lineno,
-                    "docstring": ast.get_docstring(node),
-                    "methods": methods,
-                    "bases": bases,
-                }
-            )
-        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            # Only capture top-level functions, not methods
-            entity_type = "async_function" if isinstance(node, ast.AsyncFunctionDef) else "function"
-            entities.append(
-                {
-                    "type": entity_type,
-                    "name": node.name,
-                    "lineno": node.lineno,
-                    "end_lineno": node.end_lineno or node.lineno,
-                    "docstring": ast.get_docstring(node),
-                }
-            )
+            for member in node.body:
+                member_entity = _definition_entity(member)
+                if member_entity is not None:
+                    entities.append(member_entity)
 
     return entities
 
 
-def compute_metrics(source: str) -> tuple[list[dict[str, Any]], dict[str, int]]:
+def compute_metrics(source: str, tree: ast.AST | None = None) -> tuple[list[dict[str, Any]], dict[str, int]]:
     """Compute complexity and raw metrics.
 
     Args:
         source: Python source code
+        tree: Already-parsed AST of source, to avoid parsing it again
 
     Returns:
         Tuple of (complexity list, raw metrics dict)
     """
     try:
-        complexity = cc_visit(source)
+        complexity = cc_visit(source) if tree is None else cc_visit_ast(tree)
         complexity_data = [
             {
                 "function": item.name,
@@ -99,53 +256,247 @@ def compute_metrics(source: str) -> tuple[list[dict[str, Any]], dict[str, int]]:
     return complexity_data, raw
 
 
-def extract_git_metadata(path: Path) -> dict[str, Any]:
-    """Extract commit count, last author, last date.
+def load_git_history(root: Path) -> dict[str, dict[str, Any]] | None:
+    """Collect commit count, last author and last date for every file in one walk of HEAD.
+
+    Uses pygit2 when available, otherwise a single streamed ``git log``.
+    The result is cached per root and reused until HEAD moves, so repeated
+    scans (such as the watch loop's rescans) do not walk the history again.
+    Callers must treat the returned dict as read-only.
+
+    Commits are counted during one walk of the whole history rather than per
+    file, so a count can exceed ``git rev-list --count HEAD -- <path>``. When
+    a merge keeps one parent's version of a file, per-path history
+    simplification drops the other parent's changes to it, while this walk
+    still counts the commits that made them. Linear histories count the same.
+
+    Args:
+        root: Directory being scanned (may be a subdirectory of the repository)
+
+    Returns:
+        Dict mapping root-relative POSIX paths to git metadata, or None if
+        root is not inside a git work tree
+    """
+    head = _head_commit(root)
+    key = os.fspath(root.resolve())
+    cached = _GIT_HISTORY_CACHE.get(key)
+    if head is not None and cached is not None and cached[0] == head:
+        return cached[1]
+
+    history = _pygit2_history(root) if PYGIT2_AVAILABLE else _git_log_history(root)
+    if head is not None and history is not None:
+        _GIT_HISTORY_CACHE[key] = (head, history)
+    return history
+
+
+def _head_commit(root: Path) -> str | None:
+    """Get the commit HEAD points at, to tell whether cached history is current.
 
     Args:
-        path: Path to file
+        root: Directory inside the work tree
 
     Returns:
-        Dict with commits, last_author, last_commit
+        Hex commit id, or None if root is not in a repository or HEAD is unborn
     """
+    if PYGIT2_AVAILABLE:
+        try:
+            repo_path = pygit2.discover_repository(str(root))
+            if repo_path is None:
+                return None
+            repo = pygit2.Repository(repo_path)
+            return None if repo.head_is_unborn else str(repo.head.target)
+        except (pygit2.GitError, OSError):
+            return None
+
     try:
-        # Get commit count
         result = subprocess.run(  # noqa: S603
-            ["git", "rev-list", "--count", "HEAD", "--", str(path)],  # noqa: S607
+            ["git", "rev-parse", "--verify", "-q", "HEAD"],  # noqa: S607
+            cwd=root,
             capture_output=True,
             text=True,
             check=False,
-            timeout=5,
         )
-        commits = int(result.stdout.strip()) if result.returncode == 0 and result.stdout.strip() else 0
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
 
-        # Get last author
-        result = subprocess.run(  # noqa: S603
-            ["git", "log", "-1", "--pretty=%an", "--", str(path)],  # noqa: S607
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=5,
+
+def _pygit2_history(root: Path) -> dict[str, dict[str, Any]] | None:
+    """Collect per-file git metadata in one pygit2 walk of HEAD.
+
+    Args:
+        root: Directory being scanned (may be a subdirectory of the repository)
+
+    Returns:
+        Dict mapping root-relative POSIX paths to git metadata, or None if
+        root is not inside a git work tree
+    """
+    try:
+        repo_path = pygit2.discover_repository(str(root))
+        if repo_path is None:
+            return None
+        repo = pygit2.Repository(repo_path)
+        if repo.is_bare:
+            return None
+        if repo.head_is_unborn:
+            return {}
+
+        prefix = root.resolve().relative_to(Path(repo.workdir).resolve()).as_posix()
+        prefix = "" if prefix == "." else f"{prefix}/"
+
+        history: dict[str, dict[str, Any]] = {}
+        # Walk is newest-first (children before parents), so the first commit seen for a path is its last change
+        for commit in repo.walk(repo.head.target, pygit2.enums.SortMode.TOPOLOGICAL | pygit2.enums.SortMode.TIME):
+            touched = _commit_paths(commit)
+            if not touched:
+                continue
+            author = commit.author
+            last_commit = datetime.fromtimestamp(author.time, timezone(timedelta(minutes=author.offset)))
+            for path in touched:
+                if not path.startswith(prefix):
+                    continue
+                entry = history.get(path)
+                if entry is None:
+                    history[path] = {
+                        "commits": 1,
+                        "last_author": author.name,
+                        "last_commit": last_commit.strftime("%Y-%m-%d"),
+                    }
+                else:
+                    entry["commits"] += 1
+    except (pygit2.GitError, OSError, ValueError):
+        return None
+
+    return {path[len(prefix) :]: meta for path, meta in history.items()}
+
+
+def collect_type_errors(paths: list[Path]) -> dict[str, int] | None:
+    """Run mypy once over many files and count the errors reported in each.
+
+    Args:
+        paths: Python files to type check
+
+    Returns:
+        Dict mapping normalized absolute paths (see ``_path_key``) to error
+        counts, or None if mypy is unavailable or hit a blocking error
+    """
+    if not MYPY_AVAILABLE or not paths:
+        return None
+
+    try:
+        stdout, _stderr, exit_code = mypy.api.run(
+            [*(str(path) for path in paths), "--show-error-codes", "--no-error-summary"]
         )
-        last_author = result.stdout.strip() if result.returncode == 0 else ""
+    except Exception:  # noqa: S112
+        return None
+    if exit_code not in (0, 1):
+        # Blocking errors (e.g. duplicate module names) stop checking altogether
+        return None
 
-        # Get last commit date
-        result = subprocess.run(  # noqa: S603
-            ["git", "log", "-1", "--pretty=%ad", "--date=short", "--", str(path)],  # noqa: S607
-            capture_output=True,
+    errors = {_path_key(path): 0 for path in paths}
+    for match in _MYPY_ERROR_RE.finditer(stdout):
+        key = _path_key(match.group("path"))
+        if key in errors:
+            errors[key] += 1
+    return errors
+
+
+def _path_key(path: str | Path) -> str:
+    """Normalize a path for matching mypy's reported filenames.
+
+    Args:
+        path: File path, relative to the working directory or absolute
+
+    Returns:
+        Normalized absolute path string
+    """
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _git_log_history(root: Path) -> dict[str, dict[str, Any]] | None:
+    """Collect per-file git metadata by parsing one ``git log --name-only`` stream.
+
+    ``git log -- .`` simplifies history for the tree as a whole, not per file,
+    so commit counts follow load_git_history's rules, not per-file ``git log``.
+
+    Args:
+        root: Directory being scanned (may be a subdirectory of the repository)
+
+    Returns:
+        Dict mapping root-relative POSIX paths to git metadata, or None if git
+        is unavailable or root is not inside a git work tree
+    """
+    history: dict[str, dict[str, Any]] = {}
+    try:
+        # -c lists merge paths that differ from every parent; commit headers start with NUL
+        proc = subprocess.Popen(  # noqa: S603
+            [  # noqa: S607
+                "git",
+                "-c",
+                "core.quotePath=false",
+                "log",
+                "--name-only",
+                "-c",
+                "--relative",
+                "--pretty=format:%x00%an%x00%ad",
+                "--date=short",
+                "HEAD",
+                "--",
+                ".",
+            ],
+            cwd=root,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            check=False,
-            timeout=5,
+            encoding="utf-8",
+            errors="replace",
         )
-        last_commit = result.stdout.strip() if result.returncode == 0 else ""
+    except OSError:
+        return None
+
+    with proc:
+        last_author = last_commit = ""
+        for line in proc.stdout or ():
+            line = line.rstrip("\n")
+            if line.startswith("\0"):
+                _, last_author, last_commit = line.split("\0", 2)
+            elif line:
+                # Log is newest-first, so the first commit seen for a path is its last change
+                entry = history.get(line)
+                if entry is None:
+                    history[line] = {"commits": 1, "last_author": last_author, "last_commit": last_commit}
+                else:
+                    entry["commits"] += 1
 
-        return {
-            "commits": commits,
-            "last_author": last_author,
-            "last_commit": last_commit,
-        }
-    except Exception:  # noqa: S112
-        return {"commits": 0, "last_author": "", "last_commit": ""}
+    if proc.returncode != 0:
+        return None
+    return history
+
+
+def _commit_paths(commit: Any) -> set[str]:
+    """Get repository paths changed by a commit.
+
+    Merge commits only count paths that differ from every parent, matching
+    the paths ``git log -c --name-only`` lists for merges.
+
+    Args:
+        commit: pygit2 commit
+
+    Returns:
+        Set of changed repository-relative paths
+    """
+    if not commit.parents:
+        diff = commit.tree.diff_to_tree(swap=True)
+        return {delta.new_file.path for delta in diff.deltas}
+
+    touched: set[str] | None = None
+    for parent in commit.parents:
+        diff = parent.tree.diff_to_tree(commit.tree)
+        paths = {delta.new_file.path for delta in diff.deltas} | {delta.old_file.path for delta in diff.deltas}
+        touched = paths if touched is None else touched & paths
+    return touched or set()
 
 
 def build_dependency_graph(files_data: list[dict[str, Any]]) -> dict[str, dict[str, list[str]]]:
@@ -159,74 +510,141 @@ def build_dependency_graph(files_data: list[dict[str, Any]]) -> dict[str, dict[s
     """
     dependencies: dict[str, dict[str, list[str]]] = {}
     imports_map: dict[str, list[str]] = {}
+    refs_map: dict[str, list[str]] = {}
 
-    # First pass: extract all imports
+    # First pass: collect imports recorded by the scanner
     for file_data in files_data:
         file_path = file_data["path"]
-        imports: list[str] = []
+        imports: list[str] | None = file_data.get("imports")
+        # Entries from before import_refs resolve by imported module only
+        refs: list[str] | None = file_data.get("import_refs", imports)
 
-        try:
-            # Re-read file to parse imports
-            tree = ast.parse(Path(file_path).read_text(encoding="utf-8"))
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(alias.name)
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        imports.append(node.module)
-        except Exception:  # noqa: S110, S112
-            pass
+        if imports is None or refs is None:
+            # Entries from older indexes lack imports; re-read the file to parse them
+            imports, refs = [], []
+            try:
+                visitor = FileVisitor()
+                visitor.visit(ast.parse(Path(file_path).read_bytes()))
+                imports, refs = visitor.imports, visitor.import_refs
+            except Exception:  # noqa: S110, S112
+                pass
 
         imports_map[file_path] = imports
+        refs_map[file_path] = refs
+
+    # Index every file under each dotted-module suffix of its path, so that
+    # "pkg.mod", "mod" and "src.pkg.mod" all resolve to src/pkg/mod.py
+    paths_by_module: dict[str, list[str]] = {}
+    for file_path in imports_map:
+        parts = file_path.replace("\\", "/").removesuffix(".py").split("/")
+        if parts[-1] == "__init__":
+            parts.pop()
+        for start in range(len(parts)):
+            paths_by_module.setdefault(".".join(parts[start:]), []).append(file_path)
+
+    # Fill in imported_by, resolving each imported name to the longest dotted
+    # prefix that is a file: "pkg.mod" is pkg/mod.py for ``from pkg import mod``,
+    # while "pkg.func" falls back to pkg/__init__.py
+    imported_by: dict[str, set[str]] = {file_path: set() for file_path in imports_map}
+    for file_path, refs in refs_map.items():
+        for ref in refs:
+            targets = paths_by_module.get(ref)
+            while not targets and "." in ref:
+                ref = ref.rpartition(".")[0]
+                targets = paths_by_module.get(ref)
+            for target in targets or ():
+                imported_by[target].add(file_path)
 
-    # Second pass: build imported_by relationships
     for file_path, imports in imports_map.items():
         dependencies[file_path] = {
             "imports": imports,
-            "imported_by": [],
+            "imported_by": sorted(imported_by[file_path]),
         }
 
-    # Fill in imported_by
-    for file_path, file_deps in dependencies.items():
-        for imported_module in file_deps["imports"]:
-            # Find files that match this module
-            for other_path in dependencies:
-                if imported_module in other_path or other_path.endswith(f"{imported_module.replace('.', '/')}.py"):
-                    dependencies[other_path]["imported_by"].append(file_path)
-
     return dependencies
 
 
 class ASTScanner:
     """Handles the scanning process for Python files."""
 
-    def __init__(self, root: Path):
+    def __init__(self, root: Path, parallel: bool = False):
         """Initialize scanner with root directory.
 
         Args:
             root: Root directory to scan
+            parallel: Scan larger batches of files in worker processes (see scan_directory)
         """
         self.root = root
+        self.parallel = parallel
+        self._git_cache: dict[str, dict[str, Any]] | None = None
+        self._git_loaded = False
 
-    def scan_file(self, path: Path) -> dict[str, Any]:
+    def extract_git_metadata(self, path: Path) -> dict[str, Any]:
+        """Extract commit count, last author, last date.
+
+        Metadata comes from the history read once per scanner, so no git
+        process is started per file.
+
+        Args:
+            path: Path to file
+
+        Returns:
+            Dict with commits, last_author, last_commit
+        """
+        if not self._git_loaded:
+            self._git_cache = load_git_history(self.root)
+            self._git_loaded = True
+
+        rel = path.relative_to(self.root).as_posix() if path.is_relative_to(self.root) else path.as_posix()
+        meta = self._git_cache.get(rel) if self._git_cache else None
+        return dict(meta) if meta else {"commits": 0, "last_author": "", "last_commit": ""}
+
+    def scan_file(
+        self, path: Path, git_meta: dict[str, Any] | None = None, rel_path: str | None = None
+    ) -> dict[str, Any]:
         """Scan a single Python file and extract structure and metrics.
 
         Args:
             path: Path to Python file to scan
+            git_meta: Precomputed git metadata (looked up when not given)
+            rel_path: Precomputed path relative to the root (derived when not given)
 
         Returns:
             Dictionary containing file analysis data
         """
+        return self._scan_file(path, git_meta, rel_path)[0]
+
+    def _scan_file(
+        self, path: Path, git_meta: dict[str, Any] | None = None, rel_path: str | None = None
+    ) -> tuple[dict[str, Any], dict[str, set[str]], FileSnapshot | None]:
+        """Scan a file, also returning what was collected on the way for later stages.
+
+        The file is read once; its bytes and the stat stamp taken while reading
+        them are handed back so the deep analysis and the incremental cache
+        don't read (or stat) it again.
+
+        Args:
+            path: Path to Python file to scan
+            git_meta: Precomputed git metadata (looked up when not given)
+            rel_path: Precomputed path relative to the root (derived when not given)
+
+        Returns:
+            Tuple of (file analysis data, call graph, file snapshot or None if unreadable)
+        """
+        if rel_path is None:
+            rel_path = _fast_relpath(path, self.root)
+
+        snapshot: FileSnapshot | None = None
         try:
-            with open(path, encoding="utf-8") as f:
-                source = f.read()
+            snapshot = read_snapshot(path)
+            source = snapshot.data.decode("utf-8")
 
             tree = ast.parse(source, filename=str(path))
-            entities = extract_entities(tree)
-            complexity_data, raw = compute_metrics(source)
-            git_meta = extract_git_metadata(path)
+            visitor = FileVisitor()
+            visitor.visit(tree)
+            complexity_data, raw = compute_metrics(source, tree)
+            if git_meta is None:
+                git_meta = self.extract_git_metadata(path)
 
             # Calculate comment ratio
             comment_ratio = raw["comments"] / raw["loc"] if raw["loc"] > 0 else 0.0
@@ -235,43 +653,70 @@ class ASTScanner:
             test_path = str(path).replace("src/", "tests/test_").replace("\\", "/")
             has_tests = Path(test_path).exists()
 
-            return {
-                "path": str(path.relative_to(self.root) if path.is_relative_to(self.root) else path),
-                "entities": entities,
-                "complexity": complexity_data,
-                "raw": raw,
-                "comment_ratio": round(comment_ratio, 3),
-                "git": git_meta,
-                "has_tests": has_tests,
-            }
+            return (
+                {
+                    "path": rel_path,
+                    "entities": extract_entities(tree),
+                    "imports": visitor.imports,
+                    "import_refs": visitor.import_refs,
+                    "complexity": complexity_data,
+                    "raw": raw,
+                    "comment_ratio": round(comment_ratio, 3),
+                    "git": git_meta,
+                    "has_tests": has_tests,
+                },
+                visitor.calls,
+                snapshot,
+            )
         except SyntaxError as e:
-            return {
-                "path": str(path.relative_to(self.root) if path.is_relative_to(self.root) else path),
-                "entities": [],
-                "complexity": [],
-                "raw": {"loc": 0, "sloc": 0, "comments": 0, "multi": 0, "blank": 0},
-                "comment_ratio": 0.0,
-                "git": {"commits": 0, "last_author": "", "last_commit": ""},
-                "has_tests": False,
-                "error": f"SyntaxError: {e.msg} at line {e.lineno}",
-            }
+            return (
+                {
+                    "path": rel_path,
+                    "entities": [],
+                    "imports": [],
+                    "import_refs": [],
+                    "complexity": [],
+                    "raw": {"loc": 0, "sloc": 0, "comments": 0, "multi": 0, "blank": 0},
+                    "comment_ratio": 0.0,
+                    "git": {"commits": 0, "last_author": "", "last_commit": ""},
+                    "has_tests": False,
+                    "error": f"SyntaxError: {e.msg} at line {e.lineno}",
+                },
+                {},
+                snapshot,
+            )
         except Exception as e:  # noqa: S112
-            return {
-                "path": str(path.relative_to(self.root) if path.is_relative_to(self.root) else path),
-                "entities": [],
-                "complexity": [],
-                "raw": {"loc": 0, "sloc": 0, "comments": 0, "multi": 0, "blank": 0},
-                "comment_ratio": 0.0,
-                "git": {"commits": 0, "last_author": "", "last_commit": ""},
-                "has_tests": False,
-                "error": str(e),
-            }
+            return (
+                {
+                    "path": rel_path,
+                    "entities": [],
+                    "imports": [],
+                    "import_refs": [],
+                    "complexity": [],
+                    "raw": {"loc": 0, "sloc": 0, "comments": 0, "multi": 0, "blank": 0},
+                    "comment_ratio": 0.0,
+                    "git": {"commits": 0, "last_author": "", "last_commit": ""},
+                    "has_tests": False,
+                    "error": str(e),
+                },
+                {},
+                snapshot,
+            )
 
-    def _deep_analysis(self, path: Path) -> dict[str, Any]:
+    def _deep_analysis(
+        self,
+        path: Path,
+        calls: dict[str, set[str]],
+        type_errors: int | None = None,
+        source_bytes: bytes | None = None,
+    ) -> dict[str, Any]:
         """Perform deep analysis on a Python file.
 
         Args:
             path: Path to Python file
+            calls: Per-function calls collected while scanning the file
+            type_errors: mypy error count from a batched run (mypy runs on this file alone if not given)
+            source_bytes: File contents already read by the scan (read from disk if not given)
 
         Returns:
             Deep analysis results including type coverage and call graph
@@ -285,20 +730,22 @@ class ASTScanner:
         # Type coverage analysis with mypy
         if MYPY_AVAILABLE:
             try:
-                # Run mypy on single file
-                stdout, stderr, exit_code = mypy.api.run([str(path), "--show-error-codes", "--no-error-summary"])
-
-                # Count errors
-                error_count = stdout.count("error:")
+                if type_errors is None:
+                    # Run mypy on single file
+                    stdout, stderr, exit_code = mypy.api.run([str(path), "--show-error-codes", "--no-error-summary"])
+                    error_count = 0 if exit_code == 0 else stdout.count("error:")
+                else:
+                    error_count = type_errors
 
                 # Estimate type coverage (rough heuristic)
-                # If no errors and exit_code == 0, assume good coverage
-                if exit_code == 0:
+                # If no errors, assume good coverage
+                if error_count == 0:
                     result["type_coverage"] = 1.0
                 else:
                     # Estimate based on error density
-                    source = path.read_text(encoding="utf-8")
-                    loc = len([line for line in source.splitlines() if line.strip()])
+                    if source_bytes is None:
+                        source_bytes = path.read_bytes()
+                    loc = sum(1 for line in source_bytes.splitlines() if line.strip())
                     if loc > 0:
                         error_ratio = min(error_count / loc, 1.0)
                         result["type_coverage"] = max(0.0, 1.0 - error_ratio)
@@ -309,53 +756,7 @@ class ASTScanner:
                 pass
 
         # Call graph analysis (simple version - track function calls)
-        try:
-            source = path.read_text(encoding="utf-8")
-            tree = ast.parse(source)
-
-            calls: dict[str, list[str]] = {}
-
-            class CallVisitor(ast.NodeVisitor):
-                """Visit function definitions and track their calls."""
-
-                def __init__(self) -> None:
-                    self.current_func: str | None = None
-
-                def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
-                    """Visit function definition."""
-                    self.current_func = node.name
-                    calls[node.name] = []
-                    self.generic_visit(node)
-                    self.current_func = None
-
-                def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
-                    """Visit async function definition."""
-                    self.current_func = node.name
-                    calls[node.name] = []
-                    self.generic_visit(node)
-                    self.current_func = None
-
-                def visit_Call(self, node: ast.Call) -> None:
-                    """Visit function call."""
-                    if self.current_func:
-                        # Extract called function name
-                        if isinstance(node.func, ast.Name):
-                            called = node.func.id
-                            if called not in calls[self.current_func]:
-                                calls[self.current_func].append(called)
-                        elif isinstance(node.func, ast.Attribute):
-                            called = node.func.attr
-                            if called not in calls[self.current_func]:
-                                calls[self.current_func].append(called)
-                    self.generic_visit(node)
-
-            visitor = CallVisitor()
-            visitor.visit(tree)
-
-            result["call_graph"] = calls
-
-        except Exception:  # noqa: S110, S112
-            pass
+        result["call_graph"] = {func: sorted(called) for func, called in calls.items()}
 
         return result
 
@@ -364,6 +765,7 @@ class ASTScanner:
         incremental: bool = False,
         deep: bool = False,
         progress_callback: Callable[[str, int, int], None] | None = None,
+        index_file: str | Path = "code_index.json",
     ) -> dict[str, Any]:
         """Scan all Python files in directory recursively.
 
@@ -371,91 +773,347 @@ class ASTScanner:
             incremental: Use incremental caching to skip unchanged files
             deep: Enable deep analysis (call graphs, type coverage)
             progress_callback: Optional callback(file_path, current, total) for progress updates
+            index_file: Previously written index whose entries are reused for unchanged files
 
         Returns:
             Complete code_index dict
         """
-        from code_atlas.cache import FileCache
+        return self._build_index(list(self.iter_files(incremental, deep, progress_callback, index_file)))
 
-        files: list[dict[str, Any]] = []
+    def iter_files(
+        self,
+        incremental: bool = False,
+        deep: bool = False,
+        progress_callback: Callable[[str, int, int], None] | None = None,
+        index_file: str | Path = "code_index.json",
+    ) -> Iterator[dict[str, Any]]:
+        """Scan all Python files in directory recursively, yielding each file's data in walk order.
+
+        The previous index is read and unchanged files are resolved before
+        the first entry is yielded; the cache is saved once the last one is.
+        Parallel results that complete ahead of an earlier file are held
+        until it arrives; that buffer is not bounded, so a slow file early
+        in the walk can keep many later entries in memory.
+
+        Args:
+            incremental: Use incremental caching to skip unchanged files
+            deep: Enable deep analysis (call graphs, type coverage)
+            progress_callback: Optional callback(file_path, current, total) for progress updates
+            index_file: Previously written index whose entries are reused for unchanged files
+
+        Yields:
+            File analysis dicts
+        """
         cache = FileCache() if incremental else None
         skipped_count = 0
         scanned_count = 0
 
         # Load existing index if incremental
-        existing_data: dict[str, Any] = {}
+        existing_files: dict[str, dict[str, Any]] = {}
         if incremental and cache:
-            index_file = Path("code_index.json")
-            if index_file.exists():
+            index_path = Path(index_file)
+            if index_path.exists():
                 try:
-                    existing_data = json.loads(index_file.read_text(encoding="utf-8"))
+                    existing_data = jsonio.loads(index_path.read_bytes())
                     # Build lookup for existing file data
                     existing_files = {f["path"]: f for f in existing_data.get("files", [])}
+                    # Keep only the file entries; the rest of the old index is released before scanning
+                    del existing_data
                 except (json.JSONDecodeError, OSError):
                     existing_files = {}
-            else:
-                existing_files = {}
 
-        # Collect all Python files first to know total count (skip common ignore patterns)
-        ignore_patterns = {".venv", "venv", "__pycache__", ".git", "node_modules", ".pytest_cache", ".mypy_cache"}
-        all_py_files = [
-            f for f in self.root.rglob("*.py") if not any(ignored in f.parts for ignored in ignore_patterns)
-        ]
+        # Collect all Python files first to know total count (ignored directories are never entered)
+        root_str = os.fspath(self.root)
+        all_py_files = list(_walk_python_files(root_str))
         total_files = len(all_py_files)
 
-        for idx, py_file in enumerate(all_py_files, 1):
-            try:
-                # Report progress
+        # Reuse unchanged files in this process; only cold files are dispatched for scanning.
+        # Results are held until every earlier slot is filled so entries come out in walk order.
+        ready: dict[int, dict[str, Any]] = {}
+        to_scan: list[tuple[int, Path, str]] = []
+        done = 0
+        # Each path is rendered as a string once and reused for the cache and the index
+        path_strs: list[str] = []
+        for slot, py_file in enumerate(all_py_files):
+            path_str = os.fspath(py_file)
+            path_strs.append(path_str)
+            rel_path = _fast_relpath(path_str, root_str)
+            if cache and rel_path in existing_files and cache.is_unchanged(path_str):
+                ready[slot] = existing_files.pop(rel_path)
+                skipped_count += 1
+                done += 1
                 if progress_callback:
-                    rel_path = str(py_file.relative_to(self.root) if py_file.is_relative_to(self.root) else py_file)
-                    progress_callback(rel_path, idx, total_files)
+                    progress_callback(rel_path, done, total_files)
+                continue
 
-                # Check if file is unchanged (incremental mode)
-                if cache and cache.is_unchanged(py_file):
-                    # Reuse existing data
-                    rel_path = str(py_file.relative_to(self.root) if py_file.is_relative_to(self.root) else py_file)
-                    if rel_path in existing_files:
-                        files.append(existing_files[rel_path])
-                        skipped_count += 1
-                        continue
+            to_scan.append((slot, py_file, rel_path))
+        existing_files.clear()
 
-                file_data = self.scan_file(py_file)
+        next_slot = 0
 
-                # Add deep analysis if requested
-                if deep:
-                    file_data["deep"] = self._deep_analysis(py_file)
+        def drain() -> Iterator[dict[str, Any]]:
+            nonlocal next_slot
+            while next_slot in ready:
+                yield ready.pop(next_slot)
+                next_slot += 1
 
-                files.append(file_data)
-                scanned_count += 1
+        yield from drain()
 
-                # Update cache
-                if cache:
-                    cache.update_file(py_file)
+        for slot, _py_file, file_data, snapshot in self._scan_files(to_scan, deep):
+            done += 1
+            if progress_callback:
+                progress_callback(file_data["path"], done, total_files)
 
-            except Exception:  # noqa: S112
-                # Skip files that cannot be parsed
-                continue
+            ready[slot] = file_data
+            scanned_count += 1
+
+            # Update cache from the bytes the scan already read, stamped when they were read
+            if cache:
+                _update_cache(cache, path_strs[slot], snapshot)
+
+            yield from drain()
+
+        # Files that failed to scan leave gaps; emit whatever is still held back
+        for slot in sorted(ready):
+            yield ready[slot]
 
         # Save cache
         if cache:
             # Cleanup stale entries
-            existing_paths = {str(py_file) for py_file in self.root.rglob("*.py")}
-            cache.cleanup(existing_paths)
+            cache.cleanup(set(path_strs))
             cache.save()
 
+    def write_index(self, output_path: Path, files: Iterable[dict[str, Any]]) -> None:
+        """Stream the code index to disk as files are produced.
+
+        Each file entry is written and released as soon as it arrives; only
+        its path, imports and symbols are kept for the dependency graph and
+        symbol index written after the files array. The document goes to a
+        temporary file that replaces output_path once complete, so the
+        previous index stays readable (and reusable by iter_files) meanwhile.
+
+        Args:
+            output_path: Path to write code_index.json
+            files: File analysis dicts, e.g. from iter_files
+        """
+        summaries: list[dict[str, Any]] = []
+        symbol_index: dict[str, str] = {}
+
+        def stream_files() -> Iterator[dict[str, Any]]:
+            for file_data in files:
+                summary = {"path": file_data["path"]}
+                for key in ("imports", "import_refs"):
+                    if key in file_data:
+                        summary[key] = file_data[key]
+                summaries.append(summary)
+                _add_symbols(symbol_index, file_data)
+                yield file_data
+
+        def fields() -> Iterator[tuple[str, Any]]:
+            yield "scanned_root", str(self.root)
+            yield "scanned_at", datetime.now().isoformat()
+            yield "version", INDEX_VERSION
+            yield "files", stream_files()
+            # Everything below depends on the files array having been consumed
+            yield "total_files", len(summaries)
+            yield "dependencies", build_dependency_graph(summaries)
+            yield "symbol_index", symbol_index
+
+        # A uniquely named temporary file, so concurrent writers to one index never share it
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{output_path.name}.", suffix=".tmp", dir=output_path.parent)
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        try:
+            jsonio.write_json_object(tmp_path, fields())
+            os.replace(tmp_path, output_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _scan_files(
+        self, to_scan: list[tuple[int, Path, str]], deep: bool
+    ) -> Iterator[tuple[int, Path, dict[str, Any], FileSnapshot | None]]:
+        """Scan files, in worker processes when parallel and there are enough of them.
+
+        Args:
+            to_scan: (slot, path, relative path) triples of files to scan
+            deep: Enable deep analysis (call graphs, type coverage)
+
+        Yields:
+            (slot, path, file_data, snapshot) for each scanned file, in completion order
+        """
+        # Type check all deep-scanned files in one mypy run instead of one run per file
+        type_errors = collect_type_errors([py_file for _, py_file, _ in to_scan]) if deep else None
+
+        def errors_for(py_file: Path) -> int | None:
+            return None if type_errors is None else type_errors.get(_path_key(py_file), 0)
+
+        workers = min(os.cpu_count() or 1, len(to_scan))
+        if not self.parallel or len(to_scan) < PARALLEL_MIN_FILES or workers < 2:
+            for slot, py_file, rel_path in to_scan:
+                try:
+                    file_data, snapshot = self._analyze(
+                        py_file, deep, type_errors=errors_for(py_file), rel_path=rel_path
+                    )
+                    yield slot, py_file, file_data, snapshot
+                except Exception:  # noqa: S112
+                    # Skip files that cannot be parsed
+                    continue
+            return
+
+        # Git history is walked once here; workers only receive each file's slice of it.
+        # Workers are never forked from this process: the watch loop calls in here with
+        # observer threads running, and forking while they hold locks can deadlock.
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        mp_context = multiprocessing.get_context(start_method)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+            futures = {
+                executor.submit(
+                    _scan_one,
+                    py_file,
+                    self.root,
+                    deep,
+                    self.extract_git_metadata(py_file),
+                    errors_for(py_file),
+                    rel_path,
+                ): (slot, py_file)
+                for slot, py_file, rel_path in to_scan
+            }
+            for future in as_completed(futures):
+                slot, py_file = futures[future]
+                try:
+                    file_data, snapshot = future.result()
+                    yield slot, py_file, file_data, snapshot
+                except Exception:  # noqa: S112
+                    # Skip files that cannot be parsed
+                    continue
+
+    def _analyze(
+        self,
+        path: Path,
+        deep: bool,
+        git_meta: dict[str, Any] | None = None,
+        type_errors: int | None = None,
+        rel_path: str | None = None,
+    ) -> tuple[dict[str, Any], FileSnapshot | None]:
+        """Scan a file and attach deep analysis if requested.
+
+        Args:
+            path: Path to Python file to scan
+            deep: Enable deep analysis (call graphs, type coverage)
+            git_meta: Precomputed git metadata (looked up when not given)
+            type_errors: mypy error count from a batched run
+            rel_path: Precomputed path relative to the root
+
+        Returns:
+            Tuple of (file analysis data, file snapshot or None if unreadable)
+        """
+        file_data, calls, snapshot = self._scan_file(path, git_meta, rel_path)
+        if deep:
+            file_data["deep"] = self._deep_analysis(path, calls, type_errors, snapshot.data if snapshot else None)
+        return file_data, snapshot
+
+    def update_index(
+        self,
+        index: dict[str, Any],
+        changed_paths: set[Path],
+        incremental: bool = False,
+        deep: bool = False,
+    ) -> dict[str, Any]:
+        """Refresh an existing index for a known set of changed files.
+
+        Only the given paths are rescanned (or dropped, if they no longer
+        exist); entries for every other file are reused without walking the tree.
+
+        Args:
+            index: Previously generated code_index dict for this root
+            changed_paths: Paths of created, modified or deleted files
+            incremental: Keep the incremental cache in sync with rescanned files
+            deep: Enable deep analysis (call graphs, type coverage)
+
+        Returns:
+            Complete code_index dict
+        """
+        return self._build_index(self.update_files(index, changed_paths, incremental, deep))
+
+    def update_files(
+        self,
+        index: dict[str, Any],
+        changed_paths: set[Path],
+        incremental: bool = False,
+        deep: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Refresh the file entries of an existing index for a known set of changed files.
+
+        Both ends of a move should be passed. A changed directory has every
+        Python file under it rescanned, and a path that no longer exists drops
+        its own entry and every entry below it, so moved or deleted
+        directories leave nothing stale behind.
+
+        Args:
+            index: Previously generated code_index dict for this root
+            changed_paths: Paths of created, modified, moved or deleted files and directories
+            incremental: Keep the incremental cache in sync with rescanned files
+            deep: Enable deep analysis (call graphs, type coverage)
+
+        Returns:
+            File analysis dicts
+        """
+        files_by_path = {f["path"]: f for f in index.get("files", [])}
+        cache = FileCache() if incremental else None
+
+        scan_paths: dict[str, Path] = {}
+        for path in changed_paths:
+            rel_path = _fast_relpath(path, self.root)
+            if not IGNORE_PATTERNS.isdisjoint(Path(rel_path).parts):
+                continue
+
+            if path.is_dir():
+                for py_file in _walk_python_files(os.fspath(path)):
+                    scan_paths[_fast_relpath(py_file, self.root)] = py_file
+            elif path.is_file():
+                if path.suffix == ".py":
+                    scan_paths[rel_path] = path
+            else:
+                prefix = rel_path + os.sep
+                for stale in [p for p in files_by_path if p == rel_path or p.startswith(prefix)]:
+                    del files_by_path[stale]
+                    if cache:
+                        cache.remove(os.fspath(self.root / stale))
+
+        to_scan = [(slot, path, rel_path) for slot, (rel_path, path) in enumerate(scan_paths.items())]
+
+        for _slot, path, file_data, snapshot in self._scan_files(to_scan, deep):
+            files_by_path[file_data["path"]] = file_data
+
+            if cache:
+                _update_cache(cache, os.fspath(path), snapshot)
+
+        if cache:
+            cache.save()
+
+        return list(files_by_path.values())
+
+    def _build_index(self, files: list[dict[str, Any]]) -> dict[str, Any]:
+        """Assemble the code index from scanned file data.
+
+        Args:
+            files: File analysis dicts
+
+        Returns:
+            Complete code_index dict
+        """
         # Build dependency graph
         dependencies = build_dependency_graph(files)
 
         # Build symbol index
         symbol_index: dict[str, str] = {}
         for file_data in files:
-            for entity in file_data.get("entities", []):
-                symbol_index[entity["name"]] = f"{file_data['path']}:{entity['lineno']}"
+            _add_symbols(symbol_index, file_data)
 
         index = {
             "scanned_root": str(self.root),
             "scanned_at": datetime.now().isoformat(),
-            "version": "0.1.0",
+            "version": INDEX_VERSION,
             "total_files": len(files),
             "files": files,
             "dependencies": dependencies,
@@ -465,24 +1123,148 @@ class ASTScanner:
         return index
 
 
+def _add_symbols(symbol_index: dict[str, str], file_data: dict[str, Any]) -> None:
+    """Record a file's entities in the symbol index.
+
+    Args:
+        symbol_index: Symbol name to "path:lineno" mapping, updated in place
+        file_data: File analysis dict
+    """
+    for entity in file_data.get("entities", []):
+        symbol_index[entity["name"]] = f"{file_data['path']}:{entity['lineno']}"
+
+
+def _update_cache(cache: FileCache, path_str: str, snapshot: FileSnapshot | None) -> None:
+    """Record a scanned file in the incremental cache.
+
+    Args:
+        cache: Incremental cache
+        path_str: Path to file
+        snapshot: Contents and stamp read by the scan (the file is read again if None)
+    """
+    if snapshot is None:
+        cache.update_file(path_str)
+    else:
+        cache.update_file(path_str, snapshot.data, snapshot.stat)
+
+
+def _fast_relpath(path: str | Path, root: str | Path) -> str:
+    """Render a path relative to the scan root, as stored in the index.
+
+    Uses string-based ``os.path.relpath`` rather than ``Path.relative_to``.
+    Paths outside the root are returned unchanged.
+
+    Args:
+        path: File path
+        root: Root directory being scanned
+
+    Returns:
+        Relative path string
+    """
+    try:
+        rel = os.path.relpath(path, root)
+    except ValueError:
+        # Different drive on Windows
+        return os.fspath(path)
+    if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+        return os.fspath(path)
+    return rel
+
+
+def _walk_python_files(directory: str) -> Iterator[Path]:
+    """Recursively yield Python files, pruning ignored directories before descending.
+
+    Files in a directory are yielded before its subdirectories are walked.
+    Symlinked directories are not followed.
+
+    Args:
+        directory: Directory to walk
+
+    Yields:
+        Paths of .py files
+    """
+    subdirs: list[str] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in IGNORE_PATTERNS:
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    yield Path(entry.path)
+    except OSError:
+        return
+
+    for subdir in subdirs:
+        yield from _walk_python_files(subdir)
+
+
+def _scan_one(
+    path: Path,
+    root: Path,
+    deep: bool,
+    git_meta: dict[str, Any] | None = None,
+    type_errors: int | None = None,
+    rel_path: str | None = None,
+) -> tuple[dict[str, Any], FileSnapshot | None]:
+    """Scan a single file; module-level so it can run in a worker process.
+
+    Args:
+        path: Path to Python file to scan
+        root: Root directory being scanned
+        deep: Enable deep analysis (call graphs, type coverage)
+        git_meta: Precomputed git metadata from the parent process
+        type_errors: mypy error count from the parent's batched run
+        rel_path: Path relative to the root, computed by the parent
+
+    Returns:
+        Tuple of (file analysis data, file snapshot for the parent's cache)
+    """
+    return ASTScanner(root)._analyze(path, deep, git_meta=git_meta, type_errors=type_errors, rel_path=rel_path)
+
+
 def scan_directory(
     root_path: Path,
     output_path: Path,
     incremental: bool = False,
     deep: bool = False,
     progress_callback: Callable[[str, int, int], None] | None = None,
+    changed_paths: set[Path] | None = None,
+    parallel: bool = False,
 ) -> None:
     """Scan a directory of Python files and write index.
 
+    With parallel set, batches of PARALLEL_MIN_FILES or more files are
+    scanned in a process pool started with forkserver (or spawn), which
+    re-imports the calling script's main module in each worker. Scripts
+    that enable it must keep their entry point under an
+    ``if __name__ == "__main__":`` guard. The CLI enables it.
+
     Args:
         root_path: Root directory to scan
         output_path: Path to write code_index.json
         incremental: Use incremental caching to skip unchanged files
         deep: Enable deep analysis (call graphs, type coverage)
         progress_callback: Optional callback(file_path, current, total) for progress updates
+        changed_paths: Files or directories known to have changed (both ends of a move)
+            since output_path was written; when given, only these are rescanned and the
+            rest of the existing index is reused
+        parallel: Scan larger batches of files in worker processes
     """
-    scanner = ASTScanner(root_path)
-    index = scanner.scan_directory(incremental=incremental, deep=deep, progress_callback=progress_callback)
+    scanner = ASTScanner(root_path, parallel=parallel)
+
+    files: Iterable[dict[str, Any]] | None = None
+    if changed_paths is not None and output_path.exists():
+        try:
+            existing = jsonio.loads(output_path.read_bytes())
+        except (json.JSONDecodeError, OSError):
+            existing = None
+        if existing and existing.get("scanned_root") == str(root_path):
+            files = scanner.update_files(existing, changed_paths, incremental=incremental, deep=deep)
+
+    if files is None:
+        files = scanner.iter_files(
+            incremental=incremental, deep=deep, progress_callback=progress_callback, index_file=output_path
+        )
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(index, f, indent=2)
+    scanner.write_index(output_path, files)
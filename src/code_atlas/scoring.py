@@ -1,9 +1,10 @@
 """Scoring system for refactor prioritization."""
 
+import heapq
 from pathlib import Path
 from typing import Any
 
-import yaml
+from code_atlas.rules import load_rules_config
 
 
 class ScoringEngine:
@@ -18,10 +19,9 @@ class ScoringEngine:
         self.weights: dict[str, float] = {}
 
         try:
-            with open(rules_path, encoding="utf-8") as f:
-                config = yaml.safe_load(f)
-                if config and "weights" in config:
-                    self.weights = config["weights"]
+            config = load_rules_config(rules_path)
+            if config and "weights" in config:
+                self.weights = config["weights"]
         except FileNotFoundError:
             pass
 
@@ -77,11 +77,12 @@ class ScoringEngine:
             "score": round(score, 3),
         }
 
-    def rank(self, index: dict[str, Any]) -> list[dict[str, Any]]:
+    def rank(self, index: dict[str, Any], top: int | None = None) -> list[dict[str, Any]]:
         """Rank all files by refactor priority score.
 
         Args:
             index: Complete code index from scanner
+            top: Only return the highest-scoring N files (None for all)
 
         Returns:
             Sorted list of files with scores (highest priority first)
@@ -89,15 +90,12 @@ class ScoringEngine:
         dependencies = index.get("dependencies", {})
         files = index.get("files", [])
 
-        scores: list[dict[str, Any]] = []
-        for file_data in files:
-            score_data = self.score_file(file_data, dependencies)
-            scores.append(score_data)
+        scores = (self.score_file(file_data, dependencies) for file_data in files)
 
-        # Sort by score descending
-        scores.sort(key=lambda x: float(x["score"]), reverse=True)
-
-        return scores
+        # Sort by score descending; a bounded heap keeps top-N selection O(N log top)
+        if top is not None:
+            return heapq.nlargest(top, scores, key=lambda x: float(x["score"]))
+        return sorted(scores, key=lambda x: float(x["score"]), reverse=True)
 
     def _get_avg_complexity(self, file_data: dict[str, Any]) -> float:
         """Get average complexity for a file.
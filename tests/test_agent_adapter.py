@@ -128,6 +128,15 @@ def test_get_rule_violations(adapter_with_mocks):
     assert violations[0]["rule_id"] == "RULE-001"
 
 
+def test_rule_violations_evaluated_once(adapter_with_mocks):
+    """Test summary and violation report share one evaluation pass."""
+    summary = adapter_with_mocks.summarize_state()
+    violations = adapter_with_mocks.get_rule_violations()
+
+    assert summary["rule_violations"] == len(violations)
+    assert adapter_with_mocks.rules.evaluate.call_count == 3
+
+
 def test_get_complex_functions(adapter_with_mocks):
     """Test complex function discovery."""
     results = adapter_with_mocks.get_complex_functions(threshold=10)
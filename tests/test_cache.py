@@ -1,9 +1,12 @@
 """Tests for file caching system."""
 
+import json
+import os
 from pathlib import Path
 
 import pytest
 
+from code_atlas import cache as cache_module
 from code_atlas.cache import FileCache
 
 
@@ -31,7 +34,22 @@ def test_cache_compute_hash(temp_cache, tmp_path):
     file_hash = temp_cache.compute_hash(test_file)
 
     assert isinstance(file_hash, str)
-    assert len(file_hash) == 64  # SHA-256 hex digest length
+    assert len(file_hash) == 64  # 256-bit hex digest length
+
+
+@pytest.mark.parametrize("use_blake3", [True, False])
+def test_cache_compute_hash_from_bytes(temp_cache, tmp_path, monkeypatch, use_blake3):
+    """Test hashing already-read contents matches hashing the file."""
+    if use_blake3 and not cache_module.BLAKE3_AVAILABLE:
+        pytest.skip("blake3 not installed")
+    monkeypatch.setattr(cache_module, "BLAKE3_AVAILABLE", use_blake3)
+    test_file = tmp_path / "test.py"
+    test_file.write_bytes(b"print('hello')\n")
+
+    file_hash = temp_cache.compute_hash(test_file)
+
+    assert temp_cache.compute_hash(test_file, b"print('hello')\n") == file_hash
+    assert len(file_hash) == 64
 
 
 def test_cache_set_get_hash(temp_cache):
@@ -152,3 +170,61 @@ def test_cache_compute_hash_missing_file(temp_cache, tmp_path):
     file_hash = temp_cache.compute_hash(missing_file)
 
     assert file_hash == ""  # Empty hash for missing files
+
+
+def test_cache_is_unchanged_stat_fast_path(temp_cache, tmp_path, monkeypatch):
+    """Test matching mtime and size skip hashing, while a reset mtime falls back to the hash."""
+    test_file = tmp_path / "test.py"
+    test_file.write_text("def hello(): pass")
+    temp_cache.update_file(test_file)
+
+    def fail_hash(file_path: Path) -> str:
+        raise AssertionError("file should not be hashed")
+
+    with monkeypatch.context() as m:
+        m.setattr(temp_cache, "compute_hash", fail_hash)
+        assert temp_cache.is_unchanged(test_file) is True
+
+    # Same content with a new mtime (e.g. after a branch switch) still hits via the hash
+    stat = test_file.stat()
+    os.utime(test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert temp_cache.is_unchanged(test_file) is True
+    assert temp_cache.stats[str(test_file)][0] == stat.st_mtime_ns + 10**9
+
+
+def test_cache_load_legacy_format(tmp_path):
+    """Test caches written as a flat path -> hash mapping still load."""
+    cache_file = tmp_path / "legacy_cache.json"
+    cache_file.write_text(json.dumps({"file1.py": "hash1"}))
+
+    cache = FileCache(cache_file)
+
+    assert cache.get_hash("file1.py") == "hash1"
+    assert cache.stats == {}
+
+
+def test_cache_accepts_str_paths(temp_cache, tmp_path):
+    """Test string and Path arguments address the same cache entry."""
+    test_file = tmp_path / "test.py"
+    test_file.write_text("def hello(): pass")
+
+    temp_cache.update_file(os.fspath(test_file))
+
+    assert temp_cache.is_unchanged(test_file) is True
+    assert temp_cache.is_unchanged(os.fspath(test_file)) is True
+
+
+def test_cache_update_file_keeps_stamp_of_read_contents(temp_cache, tmp_path):
+    """Test contents read before an edit are stored with their own stamp, not the edited file's."""
+    test_file = tmp_path / "test.py"
+    test_file.write_text("def hello(): pass")
+    old_data, old_stat = cache_module.read_snapshot(test_file)
+    test_file.write_text("def hello(): return 1")
+
+    temp_cache.update_file(test_file, old_data, old_stat)
+    assert temp_cache.is_unchanged(test_file) is False
+
+    # Contents supplied without a stamp are never stamped with a fresh stat
+    temp_cache.update_file(test_file, old_data)
+    assert str(test_file) not in temp_cache.stats
+    assert temp_cache.is_unchanged(test_file) is False
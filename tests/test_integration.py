@@ -58,7 +58,7 @@ def complex_function(x, y, z):
 
         # Verify scan results
         assert index_data["scanned_root"] == str(tmppath)
-        assert index_data["version"] == "0.1.0"
+        assert index_data["version"] == "0.2.0"
         assert len(index_data["files"]) == 2
 
         # Write index to file
@@ -0,0 +1,98 @@
+"""Tests for JSON serialization helpers."""
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from code_atlas import jsonio
+
+
+def test_dumps_roundtrip() -> None:
+    """Test serialized bytes parse back to the original object."""
+    data = {"files": [{"path": "a.py", "score": 0.5}], "name": "naïve"}
+
+    encoded = jsonio.dumps(data)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == data
+
+
+def test_dumps_stdlib_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test serialization without orjson installed."""
+    monkeypatch.setattr(jsonio, "ORJSON_AVAILABLE", False)
+
+    encoded = jsonio.dumps([{"id": "R001"}])
+
+    assert json.loads(encoded) == [{"id": "R001"}]
+    assert b"\n  " in encoded  # Indented output
+
+
+def test_loads_bytes_and_str() -> None:
+    """Test parsing from both bytes and text input."""
+    assert jsonio.loads(b'{"files": []}') == {"files": []}
+    assert jsonio.loads('{"files": []}') == {"files": []}
+
+
+def test_loads_invalid_raises_decode_error() -> None:
+    """Test invalid documents raise the stdlib decode error type."""
+    with pytest.raises(json.JSONDecodeError):
+        jsonio.loads(b"{ invalid json")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_write_json_array(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, use_orjson: bool) -> None:
+    """Test streamed arrays are valid JSON with one element per line."""
+    if use_orjson and not jsonio.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(jsonio, "ORJSON_AVAILABLE", use_orjson)
+    output = tmp_path / "out.json"
+    items = [{"id": "R001", "file": "a.py"}, {"id": "R002", "file": "b.py"}]
+
+    jsonio.write_json_array(output, iter(items))
+
+    assert json.loads(output.read_bytes()) == items
+    assert len(output.read_text(encoding="utf-8").splitlines()) == 4
+
+
+def test_write_json_array_empty(tmp_path: Path) -> None:
+    """Test an empty iterable produces an empty array."""
+    output = tmp_path / "empty.json"
+
+    jsonio.write_json_array(output, [])
+
+    assert json.loads(output.read_bytes()) == []
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_write_json_object(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, use_orjson: bool) -> None:
+    """Test streamed objects are valid JSON and fields are pulled after earlier values are written."""
+    if use_orjson and not jsonio.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(jsonio, "ORJSON_AVAILABLE", use_orjson)
+    output = tmp_path / "out.json"
+    seen: list[str] = []
+
+    def files() -> Iterator[dict[str, str]]:
+        for path in ("a.py", "b.py"):
+            seen.append(path)
+            yield {"path": path}
+
+    def fields() -> Iterator[tuple[str, Any]]:
+        yield "version", "0.1.0"
+        yield "files", files()
+        yield "total_files", len(seen)
+        yield "symbols", {"f": "a.py:1"}
+        yield "empty", iter([])
+
+    jsonio.write_json_object(output, fields())
+
+    assert json.loads(output.read_bytes()) == {
+        "version": "0.1.0",
+        "files": [{"path": "a.py"}, {"path": "b.py"}],
+        "total_files": 2,
+        "symbols": {"f": "a.py:1"},
+        "empty": [],
+    }
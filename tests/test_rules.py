@@ -3,7 +3,10 @@
 import tempfile
 from pathlib import Path
 
-from code_atlas.rules import RuleEngine
+import pytest
+
+from code_atlas import rules
+from code_atlas.rules import RuleEngine, load_rules_config
 
 
 def test_rule_engine_init() -> None:
@@ -59,3 +62,159 @@ actions:
         issues = re.evaluate(file_data)
 
         assert isinstance(issues, list)
+
+
+def test_rule_engine_flags_violation() -> None:
+    """Test compiled conditions flag matching files only."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        rules_file = Path(tmpdir) / "rules.yaml"
+
+        rules_file.write_text(
+            """
+metrics:
+  max_loc: 100
+
+actions:
+  - id: R002
+    condition: "loc > max_loc"
+    message: "File too large"
+    action: "Split"
+  - id: BROKEN
+    condition: "loc >"
+    message: "Never reported"
+    action: "None"
+""",
+            encoding="utf-8",
+        )
+
+        re = RuleEngine(rules_file)
+
+        large = re.evaluate({"path": "big.py", "raw": {"loc": 250}, "complexity": []})
+        small = re.evaluate({"path": "small.py", "raw": {"loc": 50}, "complexity": []})
+
+        assert [v["id"] for v in large] == ["R002"]
+        assert large[0]["file"] == "big.py"
+        assert small == []
+
+
+def test_rule_engine_condition_forms() -> None:
+    """Test native predicates and eval fallback agree on compound conditions."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        rules_file = Path(tmpdir) / "rules.yaml"
+
+        rules_file.write_text(
+            """
+metrics:
+  max_complexity: 5
+  max_loc: 100
+  min_comment_ratio: 0.2
+
+actions:
+  - id: AND
+    condition: "complexity > max_complexity and loc > max_loc"
+  - id: OR
+    condition: "comment_ratio < min_comment_ratio or loc > 1000"
+  - id: NOT
+    condition: "not loc <= max_loc"
+  - id: CHAIN
+    condition: "0 < complexity <= 10"
+  - id: EVAL
+    condition: "loc * 2 > max_loc * 3"
+""",
+            encoding="utf-8",
+        )
+
+        re = RuleEngine(rules_file)
+        file_data = {
+            "path": "mod.py",
+            "raw": {"loc": 200},
+            "complexity": [{"complexity": 8}],
+            "comment_ratio": 0.5,
+        }
+
+        ids = [v["id"] for v in re.evaluate(file_data)]
+
+        assert ids == ["AND", "NOT", "CHAIN", "EVAL"]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_rule_engine_evaluate_all(monkeypatch: pytest.MonkeyPatch, use_numpy: bool) -> None:
+    """Test batch evaluation matches per-file evaluation order and results."""
+    if use_numpy and not rules.NUMPY_AVAILABLE:
+        pytest.skip("numpy not installed")
+    monkeypatch.setattr(rules, "NUMPY_AVAILABLE", use_numpy)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        rules_file = Path(tmpdir) / "rules.yaml"
+
+        rules_file.write_text(
+            """
+metrics:
+  max_complexity: 5
+  max_loc: 100
+  min_comment_ratio: 0.1
+
+actions:
+  - id: R001
+    condition: "complexity > max_complexity"
+  - id: R002
+    condition: "loc > max_loc and not comment_ratio >= 0.5"
+  - id: R003
+    condition: "comment_ratio < min_comment_ratio"
+  - id: R004
+    condition: "loc + 1 > max_loc"
+""",
+            encoding="utf-8",
+        )
+
+        re = RuleEngine(rules_file)
+        files = [
+            {"path": "a.py", "raw": {"loc": 300}, "complexity": [{"complexity": 9}], "comment_ratio": 0.05},
+            {"path": "b.py", "raw": {"loc": 10}, "complexity": [], "comment_ratio": 0.3},
+            {"path": "broken.py", "complexity": 15},
+            {"path": "c.py", "raw": {"loc": 100}, "complexity": [{"complexity": 2}], "comment_ratio": 0.6},
+        ]
+
+        expected = [issue for file_data in files for issue in re.evaluate(file_data)]
+        result = re.evaluate_all(files)
+
+        assert result == expected
+        assert [(v["file"], v["id"]) for v in result] == [
+            ("a.py", "R001"),
+            ("a.py", "R002"),
+            ("a.py", "R003"),
+            ("a.py", "R004"),
+            ("c.py", "R004"),
+        ]
+
+
+def test_load_rules_config_cached_until_changed(tmp_path: Path) -> None:
+    """Test parsed rules are reused until the file changes."""
+    rules_file = tmp_path / "rules.yaml"
+    rules_file.write_text("metrics:\n  max_loc: 100\n", encoding="utf-8")
+
+    first = load_rules_config(rules_file)
+    assert load_rules_config(rules_file) is first
+
+    rules_file.write_text("metrics:\n  max_loc: 2000\n", encoding="utf-8")
+
+    assert load_rules_config(rules_file)["metrics"]["max_loc"] == 2000
+
+
+def test_rule_engine_reuses_compiled_rules(tmp_path: Path) -> None:
+    """Test engines built from the same unchanged file share compiled rules."""
+    rules_file = tmp_path / "rules.yaml"
+    rules_file.write_text(
+        """
+actions:
+  - id: R002
+    condition: "loc > max_loc"
+""",
+        encoding="utf-8",
+    )
+
+    first = RuleEngine(rules_file)
+    second = RuleEngine(rules_file)
+
+    assert second._rules is first._rules
+    assert second.config is first.config
@@ -1,9 +1,27 @@
 """Tests for scanner module."""
 
+import ast
+import json
+import subprocess
 import tempfile
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Any
 
-from code_atlas.scanner import ASTScanner, scan_directory
+import pytest
+
+from code_atlas import cache as cache_module
+from code_atlas import scanner as scanner_module
+from code_atlas.cache import FileCache, FileSnapshot, read_snapshot
+from code_atlas.scanner import (
+    ASTScanner,
+    FileVisitor,
+    build_dependency_graph,
+    collect_type_errors,
+    extract_entities,
+    load_git_history,
+    scan_directory,
+)
 
 
 def test_scan_file_basic() -> None:
@@ -34,6 +52,148 @@ class Greeter:
         assert len(result["entities"]) >= 2
 
 
+def test_file_visitor_single_pass() -> None:
+    """Test imports and calls are collected in one traversal."""
+    tree = ast.parse(
+        """import os
+from pathlib import Path
+
+
+def outer() -> None:
+    def inner() -> None:
+        os.getcwd()
+
+    inner()
+    Path(".")
+
+
+class Box:
+    def open(self) -> None:
+        print("open")
+"""
+    )
+
+    visitor = FileVisitor()
+    visitor.visit(tree)
+
+    assert visitor.imports == ["os", "pathlib"]
+    assert visitor.calls == {"outer": {"inner", "Path"}, "inner": {"getcwd"}, "open": {"print"}}
+
+
+def test_extract_entities_top_level_and_class_members() -> None:
+    """Test only module-level definitions and class members become entities."""
+    tree = ast.parse(
+        """def outer() -> None:
+    def inner() -> None:
+        pass
+
+
+if True:
+    class Hidden:
+        pass
+
+
+class Box:
+    class Lid:
+        pass
+
+    async def open(self) -> None:
+        pass
+"""
+    )
+
+    entities = extract_entities(tree)
+
+    assert [(e["type"], e["name"]) for e in entities] == [
+        ("function", "outer"),
+        ("class", "Box"),
+        ("class", "Lid"),
+        ("async_function", "open"),
+    ]
+    assert entities[1]["methods"] == ["open"]
+
+
+def test_extract_entities_class_bases() -> None:
+    """Test base classes render as they are written in source."""
+    tree = ast.parse("class Box(Base, pkg.mod.Mixin, Generic[T], metaclass=Meta):\n    pass\n")
+
+    assert extract_entities(tree)[0]["bases"] == ["Base", "pkg.mod.Mixin", "Generic[T]"]
+
+
+def test_fast_relpath(tmp_path: Path) -> None:
+    """Test paths are rendered relative to the root, and outside paths are kept."""
+    inside = tmp_path / "pkg" / "mod.py"
+    outside = tmp_path.parent / "other.py"
+
+    assert scanner_module._fast_relpath(inside, tmp_path) == str(Path("pkg") / "mod.py")
+    assert scanner_module._fast_relpath(outside, tmp_path) == str(outside)
+
+
+def test_build_dependency_graph_resolves_modules() -> None:
+    """Test imports resolve to files by dotted module path, without duplicates."""
+    files = [
+        {"path": "src/pkg/__init__.py", "imports": []},
+        {"path": "src/pkg/core.py", "imports": ["os"]},
+        {"path": "src/pkg/cli.py", "imports": ["pkg.core", "pkg.core", "pkg"]},
+        {"path": "tests\\test_core.py", "imports": ["core"]},
+    ]
+
+    deps = build_dependency_graph(files)
+
+    assert deps["src/pkg/core.py"]["imported_by"] == ["src/pkg/cli.py", "tests\\test_core.py"]
+    assert deps["src/pkg/__init__.py"]["imported_by"] == ["src/pkg/cli.py"]
+    assert deps["src/pkg/cli.py"]["imported_by"] == []
+    assert deps["src/pkg/cli.py"]["imports"] == ["pkg.core", "pkg.core", "pkg"]
+
+
+def test_build_dependency_graph_resolves_from_imports() -> None:
+    """Test ``from pkg import mod`` links to the module, while other names link to the package."""
+    tree = ast.parse("from pkg import core, helper\nfrom pkg.core import run\nfrom . import util\n")
+    visitor = FileVisitor()
+    visitor.visit(tree)
+    files = [
+        {"path": "pkg/__init__.py", "imports": [], "import_refs": []},
+        {"path": "pkg/core.py", "imports": [], "import_refs": []},
+        {"path": "pkg/util.py", "imports": [], "import_refs": []},
+        {"path": "pkg/cli.py", "imports": visitor.imports, "import_refs": visitor.import_refs},
+    ]
+
+    deps = build_dependency_graph(files)
+
+    assert visitor.imports == ["pkg", "pkg.core"]
+    assert visitor.import_refs == ["pkg.core", "pkg.helper", "pkg.core.run", "util"]
+    assert deps["pkg/core.py"]["imported_by"] == ["pkg/cli.py"]
+    assert deps["pkg/util.py"]["imported_by"] == ["pkg/cli.py"]
+    assert deps["pkg/__init__.py"]["imported_by"] == ["pkg/cli.py"]  # via pkg.helper
+
+
+def test_collect_type_errors_apportions_by_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test one mypy run's errors are counted per requested file."""
+    pytest.importorskip("mypy")
+    good, bad = tmp_path / "good.py", tmp_path / "bad.py"
+    stdout = (
+        f"{bad}:3: error: Incompatible types in assignment  [assignment]\n"
+        f'{bad}:7:5: error: Name "x" is not defined  [name-defined]\n'
+        f"{tmp_path / 'imported.py'}:1: error: Missing return statement  [return]\n"
+        f'{good}:2: note: Revealed type is "int"\n'
+    )
+    calls: list[list[str]] = []
+
+    def fake_run(args: list[str]) -> tuple[str, str, int]:
+        calls.append(args)
+        return stdout, "", 1
+
+    monkeypatch.setattr(scanner_module.mypy.api, "run", fake_run)
+
+    errors = collect_type_errors([good, bad])
+
+    assert len(calls) == 1
+    assert errors is not None
+    assert errors[scanner_module._path_key(good)] == 0
+    assert errors[scanner_module._path_key(bad)] == 2
+    assert len(errors) == 2
+
+
 def test_scan_directory() -> None:
     """Test scanning a directory."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -46,3 +206,223 @@ def test_scan_directory() -> None:
         scan_directory(tmppath, output_file)
 
         assert output_file.exists()
+
+
+def test_scan_directory_prunes_ignored_dirs(tmp_path: Path) -> None:
+    """Test ignored directories are skipped at any depth while nested packages are found."""
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / "sub" / "deep.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "top.py").write_text("y = 1\n", encoding="utf-8")
+    (tmp_path / ".venv" / "lib").mkdir(parents=True)
+    (tmp_path / ".venv" / "lib" / "vendored.py").write_text("z = 1\n", encoding="utf-8")
+    (tmp_path / "pkg" / "__pycache__").mkdir()
+    (tmp_path / "pkg" / "__pycache__" / "cached.py").write_text("w = 1\n", encoding="utf-8")
+
+    index = ASTScanner(tmp_path).scan_directory()
+
+    assert sorted(Path(f["path"]).as_posix() for f in index["files"]) == ["pkg/sub/deep.py", "top.py"]
+
+
+def test_scan_directory_incremental_reuses_output(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test an incremental rescan reuses unchanged entries from the given output file."""
+    root = tmp_path / "proj"
+    root.mkdir()
+    (root / "mod.py").write_text("def mod() -> None:\n    pass\n", encoding="utf-8")
+    output_file = tmp_path / "custom_index.json"
+    monkeypatch.chdir(tmp_path)
+    scan_directory(root, output_file, incremental=True)
+
+    def fail_scan(*args: object, **kwargs: object) -> None:
+        raise AssertionError("unchanged file should not be rescanned")
+
+    monkeypatch.setattr(ASTScanner, "_analyze", fail_scan)
+    scan_directory(root, output_file, incremental=True)
+
+    index = json.loads(output_file.read_text(encoding="utf-8"))
+    assert [f["path"] for f in index["files"]] == ["mod.py"]
+
+
+def test_scan_directory_reads_each_file_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the scan and the incremental cache share a single read of each file."""
+    root = tmp_path / "proj"
+    root.mkdir()
+    module = root / "mod.py"
+    module.write_text("def mod() -> None:\n    pass\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    reads: list[Path] = []
+
+    def counting_read_snapshot(file_path: Path | str) -> FileSnapshot:
+        reads.append(Path(file_path))
+        return read_snapshot(file_path)
+
+    monkeypatch.setattr(scanner_module, "read_snapshot", counting_read_snapshot)
+    monkeypatch.setattr(cache_module, "read_snapshot", counting_read_snapshot)
+    scan_directory(root, tmp_path / "code_index.json", incremental=True)
+
+    assert reads == [module]
+
+
+def test_scan_directory_edit_during_scan_is_not_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a file edited after the scan read it is not recorded as unchanged."""
+    root = tmp_path / "proj"
+    root.mkdir()
+    module = root / "mod.py"
+    module.write_text("def mod() -> None:\n    pass\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    def read_then_edit(file_path: Path | str) -> FileSnapshot:
+        snapshot = read_snapshot(file_path)
+        Path(file_path).write_text("def edited() -> None:\n    pass\n", encoding="utf-8")
+        return snapshot
+
+    monkeypatch.setattr(scanner_module, "read_snapshot", read_then_edit)
+    scan_directory(root, tmp_path / "code_index.json", incremental=True)
+
+    assert FileCache().is_unchanged(module) is False
+
+
+def test_write_index_concurrent_writers(tmp_path: Path) -> None:
+    """Test a write that starts and finishes inside another one leaves both intact."""
+    (tmp_path / "mod.py").write_text("def func() -> None:\n    pass\n", encoding="utf-8")
+    scanner = ASTScanner(tmp_path)
+    output_file = tmp_path / "index.json"
+
+    def files() -> Iterator[dict[str, Any]]:
+        scanner.write_index(output_file, scanner.iter_files())
+        yield from scanner.iter_files()
+
+    scanner.write_index(output_file, files())
+
+    assert json.loads(output_file.read_text(encoding="utf-8"))["total_files"] == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["index.json", "mod.py"]
+
+
+def test_scan_directory_changed_paths(tmp_path: Path) -> None:
+    """Test rescanning only changed files updates the existing index."""
+    root = tmp_path / "proj"
+    root.mkdir()
+    (root / "keep.py").write_text("def keep() -> None:\n    pass\n", encoding="utf-8")
+    (root / "edit.py").write_text("def old() -> None:\n    pass\n", encoding="utf-8")
+    (root / "gone.py").write_text("def gone() -> None:\n    pass\n", encoding="utf-8")
+    output_file = tmp_path / "index.json"
+    scan_directory(root, output_file)
+
+    (root / "edit.py").write_text("def new() -> None:\n    pass\n", encoding="utf-8")
+    (root / "gone.py").unlink()
+    (root / "added.py").write_text("class Added:\n    pass\n", encoding="utf-8")
+    (root / "notes.txt").write_text("ignored", encoding="utf-8")
+    changed = {root / "edit.py", root / "gone.py", root / "added.py", root / "notes.txt"}
+
+    scan_directory(root, output_file, changed_paths=changed)
+
+    index = json.loads(output_file.read_text(encoding="utf-8"))
+    assert sorted(f["path"] for f in index["files"]) == ["added.py", "edit.py", "keep.py"]
+    assert index["total_files"] == 3
+    assert set(index["symbol_index"]) == {"keep", "new", "Added"}
+
+
+def test_scan_directory_changed_paths_rename(tmp_path: Path) -> None:
+    """Test passing both ends of file and directory moves leaves no stale entries."""
+    root = tmp_path / "proj"
+    (root / "pkg").mkdir(parents=True)
+    (root / "a.py").write_text("def a() -> None:\n    pass\n", encoding="utf-8")
+    (root / "b.py").write_text("def b() -> None:\n    pass\n", encoding="utf-8")
+    (root / "pkg" / "m.py").write_text("def m() -> None:\n    pass\n", encoding="utf-8")
+    output_file = tmp_path / "index.json"
+    scan_directory(root, output_file)
+
+    (root / "b.py").rename(root / "c.py")
+    (root / "pkg").rename(root / "moved")
+    changed = {root / "b.py", root / "c.py", root / "pkg", root / "moved"}
+
+    scan_directory(root, output_file, changed_paths=changed)
+
+    index = json.loads(output_file.read_text(encoding="utf-8"))
+    assert sorted(Path(f["path"]).as_posix() for f in index["files"]) == ["a.py", "c.py", "moved/m.py"]
+    assert set(index["symbol_index"]) == {"a", "b", "m"}
+
+
+def test_scan_directory_parallel_matches_sequential(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test scanning in worker processes yields the same files in walk order."""
+    for i in range(4):
+        (tmp_path / f"mod_{i}.py").write_text(f"def func_{i}() -> int:\n    return {i}\n", encoding="utf-8")
+
+    sequential = ASTScanner(tmp_path).scan_directory()
+    monkeypatch.setattr(scanner_module, "PARALLEL_MIN_FILES", 1)
+    monkeypatch.setattr(scanner_module.os, "cpu_count", lambda: 2)
+    parallel = ASTScanner(tmp_path, parallel=True).scan_directory()
+
+    assert parallel["files"] == sequential["files"]
+    assert parallel["symbol_index"] == sequential["symbol_index"]
+
+
+@pytest.mark.parametrize("use_pygit2", [True, False])
+def test_load_git_history(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, use_pygit2: bool) -> None:
+    """Test one history walk yields per-file commit metadata relative to the root."""
+    if use_pygit2:
+        pytest.importorskip("pygit2")
+    else:
+        monkeypatch.setattr(scanner_module, "PYGIT2_AVAILABLE", False)
+
+    def git(*args: str) -> None:
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)  # noqa: S603, S607
+
+    git("init", "-q")
+    git("config", "user.email", "dev@example.com")
+    git("config", "user.name", "Dev")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("a = 1\n", encoding="utf-8")
+    (tmp_path / "b.py").write_text("b = 1\n", encoding="utf-8")
+    git("add", "-A")
+    git("commit", "-q", "-m", "initial")
+    (tmp_path / "pkg" / "a.py").write_text("a = 2\n", encoding="utf-8")
+    git("commit", "-q", "-am", "update a")
+
+    history = load_git_history(tmp_path / "pkg")
+
+    assert history is not None
+    assert set(history) == {"a.py"}
+    assert history["a.py"]["commits"] == 2
+    assert history["a.py"]["last_author"] == "Dev"
+
+
+@pytest.mark.parametrize("use_pygit2", [True, False])
+def test_load_git_history_cached_until_head_moves(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, use_pygit2: bool
+) -> None:
+    """Test repeated loads reuse the history walk until a new commit lands."""
+    if use_pygit2:
+        pytest.importorskip("pygit2")
+        walker = "_pygit2_history"
+    else:
+        monkeypatch.setattr(scanner_module, "PYGIT2_AVAILABLE", False)
+        walker = "_git_log_history"
+    walks: list[Path] = []
+    walk = getattr(scanner_module, walker)
+
+    def counting_walk(root: Path) -> dict[str, dict[str, Any]] | None:
+        walks.append(root)
+        return walk(root)
+
+    monkeypatch.setattr(scanner_module, walker, counting_walk)
+
+    def git(*args: str) -> None:
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)  # noqa: S603, S607
+
+    git("init", "-q")
+    git("config", "user.email", "dev@example.com")
+    git("config", "user.name", "Dev")
+    (tmp_path / "a.py").write_text("a = 1\n", encoding="utf-8")
+    git("add", "-A")
+    git("commit", "-q", "-m", "initial")
+
+    first = load_git_history(tmp_path)
+    again = load_git_history(tmp_path)
+    (tmp_path / "a.py").write_text("a = 2\n", encoding="utf-8")
+    git("commit", "-q", "-am", "update a")
+    moved = load_git_history(tmp_path)
+
+    assert len(walks) == 2
+    assert again is first
+    assert first is not None and first["a.py"]["commits"] == 1
+    assert moved is not None and moved["a.py"]["commits"] == 2
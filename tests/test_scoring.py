@@ -107,3 +107,7 @@ def test_rank() -> None:
     assert results[0]["file"] == "complex.py"
     assert results[0]["score"] > results[1]["score"]
     assert results[1]["score"] > results[2]["score"]
+
+    top_results = se.rank(index, top=2)
+
+    assert top_results == results[:2]